@@ -0,0 +1,49 @@
+"""التحليل النصي للأخبار: التلخيص، المشاعر، والتصنيف"""
+
+# التصنيفات المحسّنة
+category_keywords = {
+    "سياسة": ["رئيس", "وزير", "انتخابات", "برلمان", "سياسة", "حكومة", "نائب", "مجلس", "دولة", "حزب"],
+    "رياضة": ["كرة", "لاعب", "مباراة", "دوري", "هدف", "فريق", "بطولة", "رياضة", "ملعب", "تدريب"],
+    "اقتصاد": ["سوق", "اقتصاد", "استثمار", "بنك", "مال", "تجارة", "صناعة", "نفط", "غاز", "بورصة"],
+    "تكنولوجيا": ["تقنية", "تطبيق", "هاتف", "ذكاء", "برمجة", "إنترنت", "رقمي", "حاسوب", "شبكة", "آيفون"],
+    "صحة": ["طب", "مرض", "علاج", "مستشفى", "دواء", "صحة", "طبيب", "فيروس", "لقاح", "وباء"],
+    "تعليم": ["تعليم", "جامعة", "مدرسة", "طالب", "دراسة", "كلية", "معهد", "تربية", "أكاديمي", "بحث"]
+}
+# الدوال المحسّنة
+def summarize(text, max_words=30):
+    if not text:
+        return "لا يوجد ملخص متاح"
+    words = text.split()
+    if len(words) <= max_words:
+        return text
+    return " ".join(words[:max_words]) + "..."
+
+def analyze_sentiment(text):
+    if not text:
+        return ":neutral_face: محايد"
+    try:
+        from textblob import TextBlob  # تحميل كسول: TextBlob ثقيلة ولا تلزم قبل أول تحليل
+        polarity = TextBlob(text).sentiment.polarity
+        if polarity > 0.1:
+            return ":smiley: إيجابي"
+        elif polarity < -0.1:
+            return ":angry: سلبي"
+        else:
+            return ":neutral_face: محايد"
+    except:
+        return ":neutral_face: محايد"
+
+def detect_category(text):
+    if not text:
+        return "غير مصنّف"
+    text_lower = text.lower()
+    category_scores = {}
+    
+    for category, words in category_keywords.items():
+        score = sum(1 for word in words if word in text_lower)
+        if score > 0:
+            category_scores[category] = score
+    
+    if category_scores:
+        return max(category_scores, key=category_scores.get)
+    return "غير مصنّف"
@@ -0,0 +1,302 @@
+"""واجهة JSON بدون واجهة رسومية لمسار جلب الأخبار
+
+التشغيل:
+    python api_service.py --host 0.0.0.0 --port 8080
+
+النقاط المتاحة:
+    GET /sources                      قائمة المصادر حسب النوع
+    GET /news?source=...              جلب أخبار مصدر واحد
+    GET /search?sources=a,b&q=...     بحث مفلتر عبر عدة مصادر
+    GET /export/{docx|xlsx|json}?...  تصدير نتائج /news أو /search
+    GET /stats                        إحصائيات دمج الطلبات المتزامنة
+    GET /trends?source=|category=     الكلمات الصاعدة (الكل افتراضياً)
+
+معاملات الجلب: method, max_pages, keywords (أو q), category, date_from, date_to
+(بصيغة YYYY-MM-DD)، replay=1، و format=ndjson لبث النتائج سطراً بسطر.
+
+الخادم غير متزامن (aiohttp)؛ الجلب المتزامن يعمل في مجمع خيوط محدود الحجم
+فلا يُحجز خيط لكل عميل، والطلبات المتطابقة تتشارك النتيجة المخزنة مؤقتاً.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from aiohttp import web
+
+import reporting
+from analysis import category_keywords
+from articles import ArticleBatch
+from exporters import export_to_word, export_to_excel, export_to_json
+from fetchers import smart_news_fetcher, fetch_flight_stats
+from sources import SOURCE_GROUPS, get_source_info
+from trends import ALL_SCOPE, default_engine as trend_engine
+
+CACHE_TTL = float(os.environ.get("NEWS_API_CACHE_TTL", "300"))
+CACHE_SIZE = int(os.environ.get("NEWS_API_CACHE_SIZE", "256"))
+WORKERS = int(os.environ.get("NEWS_API_WORKERS", "8"))
+
+METHODS = ["auto", "rss", "html", "dynamic", "bs4", "api"]
+
+# أنواع الملفات المصدّرة: الامتداد -> (الدالة، نوع المحتوى)
+EXPORTS = {
+    "docx": (export_to_word, "application/vnd.openxmlformats-officedocument.wordprocessingml.document"),
+    "xlsx": (export_to_excel, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "json": (export_to_json, "application/json")
+}
+
+STREAM_CHUNK = 50  # عدد الأخبار في كل دفعة عند البث
+EXPORT_CHUNK = 256 * 1024  # حجم دفعة بث ملفات التصدير بالبايت
+
+
+class ResultCache:
+    """تخزين مؤقت للنتائج مع مدة صلاحية، ودمج الطلبات المتطابقة الجارية"""
+
+    def __init__(self, ttl=CACHE_TTL, max_size=CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._pending = {}
+
+    async def get_or_compute(self, key, compute):
+        now = time.monotonic()
+        cached = self._items.get(key)
+        if cached and now - cached[0] < self.ttl:
+            self._items.move_to_end(key)
+            return cached[1]
+
+        if key in self._pending:
+            return await asyncio.shield(self._pending[key])
+
+        future = asyncio.ensure_future(compute())
+        self._pending[key] = future
+        try:
+            value = await asyncio.shield(future)
+        finally:
+            self._pending.pop(key, None)
+
+        self._items[key] = (time.monotonic(), value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+        return value
+
+
+def _json_dumps(data):
+    return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def _error(status, message):
+    return web.json_response({"error": message}, status=status, dumps=_json_dumps)
+
+
+def _parse_date(value, default):
+    if not value:
+        return default
+    return date.fromisoformat(value)
+
+
+def _fetch_params(request):
+    """قراءة معاملات الجلب من الطلب (ValueError عند القيم غير الصالحة)"""
+    query = request.query
+    method = query.get("method", "auto")
+    if method not in METHODS:
+        raise ValueError(f"طريقة جلب غير معروفة: {method}")
+    category = query.get("category", "الكل")
+    if category != "الكل" and category not in category_keywords:
+        raise ValueError(f"تصنيف غير معروف: {category}")
+    today = datetime.today().date()
+    return {
+        "keywords": query.get("keywords", query.get("q", "")),
+        "date_from": _parse_date(query.get("date_from"), today - timedelta(days=14)),
+        "date_to": _parse_date(query.get("date_to"), today),
+        "chosen_category": category,
+        "method": method,
+        "max_pages": max(1, min(int(query.get("max_pages", "5")), 10)),
+        "replay": query.get("replay") == "1"
+    }
+
+
+def _requested_sources(request):
+    query = request.query
+    if request.path == "/news":
+        if not query.get("source"):
+            raise ValueError("المعامل source مطلوب")
+        names = [query["source"]]
+    elif "source" in query:
+        names = [query["source"]]
+    else:
+        names = [name.strip() for name in query.get("sources", "").split(",") if name.strip()]
+        if not names:
+            names = [name for group in SOURCE_GROUPS.values() for name in group]
+    missing = [name for name in names if get_source_info(name) is None]
+    if missing:
+        raise LookupError(f"مصدر غير معروف: {', '.join(missing)}")
+    return names
+
+
+def _fetch_and_ingest(source_name, params):
+    news = smart_news_fetcher(source_name, get_source_info(source_name), **params)
+    trend_engine.ingest(news)
+    return ArticleBatch.from_dicts(news)
+
+
+async def _fetch_source(app, source_name, params):
+    key = (source_name,) + tuple(sorted((k, str(v)) for k, v in params.items()))
+
+    def compute():
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(
+            app["executor"],
+            lambda: _fetch_and_ingest(source_name, params)
+        )
+
+    return await app["cache"].get_or_compute(key, compute)
+
+
+async def _collect(request):
+    """جلب الأخبار من المصادر المطلوبة بالتوازي (ArticleBatch)"""
+    params = _fetch_params(request)
+    names = _requested_sources(request)
+    results = await asyncio.gather(*(_fetch_source(request.app, name, params) for name in names))
+    return results[0] if len(results) == 1 else ArticleBatch.concat(results)
+
+
+async def _stream_news(request, news):
+    """بث النتائج على دفعات: مصفوفة JSON أو NDJSON"""
+    ndjson = request.query.get("format") == "ndjson"
+    response = web.StreamResponse(headers={
+        "Content-Type": "application/x-ndjson; charset=utf-8" if ndjson else "application/json; charset=utf-8"
+    })
+    response.enable_chunked_encoding()
+    await response.prepare(request)
+
+    if not ndjson:
+        await response.write(b"[")
+    for start in range(0, len(news), STREAM_CHUNK):
+        chunk = news[start:start + STREAM_CHUNK]
+        if ndjson:
+            data = "".join(_json_dumps(item) + "\n" for item in chunk)
+        else:
+            data = ",".join(_json_dumps(item) for item in chunk)
+            if start:
+                data = "," + data
+        await response.write(data.encode("utf-8"))
+    if not ndjson:
+        await response.write(b"]")
+    await response.write_eof()
+    return response
+
+
+async def list_sources(request):
+    data = {}
+    for group, sources in SOURCE_GROUPS.items():
+        data[group] = []
+        for name in sources:
+            info = get_source_info(name)
+            data[group].append({"name": name, "url": info["url"], "rss_options": info.get("rss_options", [])})
+    return web.json_response(data, dumps=_json_dumps)
+
+
+async def flight_stats(request):
+    return web.json_response(fetch_flight_stats(), dumps=_json_dumps)
+
+
+async def list_trends(request):
+    query = request.query
+    if "source" in query:
+        scope = ("source", query["source"])
+    elif "category" in query:
+        scope = ("category", query["category"])
+    else:
+        scope = ALL_SCOPE
+    try:
+        limit = int(query.get("limit", "15"))
+        min_ratio = float(query.get("min_ratio", "3"))
+    except ValueError as e:
+        return _error(400, str(e))
+    trends = trend_engine.trends(scope, limit=limit, min_ratio=min_ratio)
+    return web.json_response([trend._asdict() for trend in trends], dumps=_json_dumps)
+
+
+async def fetch_news(request):
+    try:
+        news = await _collect(request)
+    except LookupError as e:
+        return _error(404, str(e))
+    except ValueError as e:
+        return _error(400, str(e))
+    return await _stream_news(request, news)
+
+
+async def export_news(request):
+    fmt = request.match_info["fmt"]
+    if fmt not in EXPORTS:
+        return _error(404, f"صيغة تصدير غير مدعومة: {fmt}")
+    try:
+        news = await _collect(request)
+    except LookupError as e:
+        return _error(404, str(e))
+    except ValueError as e:
+        return _error(400, str(e))
+
+    exporter, content_type = EXPORTS[fmt]
+    loop = asyncio.get_running_loop()
+    data = await loop.run_in_executor(request.app["executor"], exporter, news)
+    filename = f"news_{datetime.now().strftime('%Y%m%d_%H%M')}.{fmt}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if not hasattr(data, "read"):
+        return web.Response(body=data, content_type=content_type, headers=headers)
+
+    # الملفات الكبيرة (مثل تقرير Word المؤقت) تُبث على دفعات
+    response = web.StreamResponse(headers=dict(headers, **{"Content-Type": content_type}))
+    await response.prepare(request)
+    with data:
+        while True:
+            chunk = await loop.run_in_executor(request.app["executor"], data.read, EXPORT_CHUNK)
+            if not chunk:
+                break
+            await response.write(chunk)
+    await response.write_eof()
+    return response
+
+
+async def _close_executor(app):
+    app["executor"].shutdown(wait=False, cancel_futures=True)
+
+
+def create_app(workers=WORKERS):
+    # هنا لا في main: مشغّل خارجي (gunicorn أو adev) يستدعي create_app مباشرة،
+    # وبدون ذلك تذهب رسائل الحالة إلى مستقبل Streamlit الافتراضي
+    reporting.set_reporter(reporting.LogReporter())
+    app = web.Application()
+    app["executor"] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="news-fetch")
+    app["cache"] = ResultCache()
+    app.router.add_get("/sources", list_sources)
+    app.router.add_get("/stats", flight_stats)
+    app.router.add_get("/trends", list_trends)
+    app.router.add_get("/news", fetch_news)
+    app.router.add_get("/search", fetch_news)
+    app.router.add_get("/export/{fmt}", export_news)
+    app.on_cleanup.append(_close_executor)
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="خدمة JSON لجلب الأخبار")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=WORKERS, help="عدد خيوط الجلب")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    web.run_app(create_app(args.workers), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""تمثيل عمودي مضغوط لمجموعة الأخبار
+
+تُخزَّن الأعمدة المتكررة (المصدر، التصنيف، المشاعر، طريقة الاستخراج) كرموز
+صحيحة في array مع قائمة قيم مشتركة، والتواريخ كأرقام في array('d').
+التجميع والفلترة تعمل على الرموز مباشرة: الشرط يُقيَّم مرة واحدة لكل قيمة
+مميزة لا لكل خبر.
+"""
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta
+
+# ترتيب الحقول كما في القواميس التي تنتجها دوال الجلب
+COLUMNS = ("source", "title", "summary", "link", "published", "image", "sentiment", "category", "extraction_method")
+CATEGORICAL = ("source", "sentiment", "category", "extraction_method")
+TEXT = ("title", "summary", "link", "image")
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _to_seconds(value):
+    # التوقيت المحلي بدون منطقة زمنية حتى يبقى العرض كما كان؛ التاريخ الذي يحمل
+    # منطقة زمنية (مثل +03:00 أو Z) يُحوَّل إلى التوقيت المحلي أولاً
+    if not isinstance(value, datetime):
+        value = datetime.now()
+    elif value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return (value - _EPOCH).total_seconds()
+
+
+class Categorical:
+    """عمود فئوي: رموز صحيحة + قائمة القيم المميزة"""
+    __slots__ = ("categories", "codes", "_index")
+
+    def __init__(self, categories=None, codes=None):
+        self.categories = list(categories or [])
+        self.codes = codes if codes is not None else array('H')
+        self._index = {value: code for code, value in enumerate(self.categories)}
+
+    def intern(self, value):
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.categories)
+            self.categories.append(value)
+        return code
+
+    def append(self, value):
+        self.codes.append(self.intern(value))
+
+    def extend(self, other):
+        remap = [self.intern(value) for value in other.categories]
+        self.codes.extend(remap[code] for code in other.codes)
+
+    def __getitem__(self, i):
+        return self.categories[self.codes[i]]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def values(self):
+        categories = self.categories
+        return [categories[code] for code in self.codes]
+
+    def counts(self):
+        """(القيمة، العدد) مرتبة تنازلياً"""
+        categories = self.categories
+        return [(categories[code], count) for code, count in Counter(self.codes).most_common()]
+
+    def matching_codes(self, predicate):
+        return {code for code, value in enumerate(self.categories) if predicate(value)}
+
+    def take(self, indices):
+        codes = self.codes
+        return Categorical(self.categories, array('H', (codes[i] for i in indices)))
+
+
+class ArticleBatch:
+    """مجموعة أخبار بتخزين عمودي؛ التكرار عليها يعطي قواميس كما في السابق"""
+    __slots__ = ("columns", "published")
+
+    def __init__(self, columns=None, published=None):
+        if columns is None:
+            columns = {name: Categorical() for name in CATEGORICAL}
+            columns.update({name: [] for name in TEXT})
+        self.columns = columns
+        self.published = published if published is not None else array('d')
+
+    @classmethod
+    def from_dicts(cls, items):
+        batch = cls()
+        for item in items:
+            batch.append(item)
+        return batch
+
+    @classmethod
+    def concat(cls, batches):
+        batch = cls()
+        for other in batches:
+            for name, column in batch.columns.items():
+                column.extend(other.columns[name])
+            batch.published.extend(other.published)
+        return batch
+
+    def append(self, item):
+        for name in CATEGORICAL:
+            self.columns[name].append(item.get(name, "غير محدد"))
+        for name in TEXT:
+            self.columns[name].append(item.get(name, ""))
+        self.published.append(_to_seconds(item.get("published")))
+
+    def __len__(self):
+        return len(self.published)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def row(self, i):
+        columns = self.columns
+        return {
+            name: (_EPOCH + timedelta(seconds=self.published[i])) if name == "published" else columns[name][i]
+            for name in COLUMNS
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.take(range(*key.indices(len(self))))
+        return self.row(key)
+
+    def column(self, name):
+        if name == "published":
+            return [_EPOCH + timedelta(seconds=s) for s in self.published]
+        column = self.columns[name]
+        return column.values() if isinstance(column, Categorical) else list(column)
+
+    def value_counts(self, name):
+        """توزيع عمود فئوي (القيمة، العدد) مرتب تنازلياً"""
+        return self.columns[name].counts()
+
+    def where(self, name, predicate):
+        """مواقع الأخبار التي يحقق عمودها الفئوي الشرط"""
+        column = self.columns[name]
+        codes = column.matching_codes(predicate)
+        return [i for i, code in enumerate(column.codes) if code in codes]
+
+    def count_where(self, name, predicate):
+        column = self.columns[name]
+        counts = Counter(column.codes)
+        return sum(counts[code] for code in column.matching_codes(predicate))
+
+    def take(self, indices):
+        indices = list(indices)
+        columns = {}
+        for name, column in self.columns.items():
+            if isinstance(column, Categorical):
+                columns[name] = column.take(indices)
+            else:
+                columns[name] = [column[i] for i in indices]
+        return ArticleBatch(columns, array('d', (self.published[i] for i in indices)))
+
+    def filter(self, name, predicate):
+        return self.take(self.where(name, predicate))
+
+    def to_dataframe(self):
+        """DataFrame بأعمدة فئوية (pandas تُحمَّل هنا فقط)"""
+        import pandas as pd
+        data = {}
+        for name in COLUMNS:
+            if name == "published":
+                data[name] = pd.to_datetime(pd.Series(self.published, dtype="float64"), unit="s")
+                continue
+            column = self.columns[name]
+            if isinstance(column, Categorical):
+                data[name] = pd.Categorical.from_codes(list(column.codes), categories=column.categories) if column.categories else pd.Categorical([])
+            else:
+                data[name] = column
+        return pd.DataFrame(data)
@@ -0,0 +1,124 @@
+"""قياس زمن الإقلاع: زمن الاستيراد لكل نظام فرعي في عملية Python جديدة
+
+الاستخدام:
+    python bench_startup.py
+    python bench_startup.py --repeat 7 --budget 1500
+
+يفشل السكربت (رمز خروج 1) إذا سحب استيراد وحدات التطبيق مكتبة ثقيلة
+بشكل مبكر، أو إذا تجاوز زمن تحميل التطبيق الميزانية المحددة بالميلي ثانية.
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def app_modules():
+    """وحدات المشروع التي يستوردها app.py مباشرة (بدون streamlit والمكتبة القياسية)"""
+    with open(os.path.join(HERE, "app.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            if os.path.exists(os.path.join(HERE, name + ".py")) and name not in modules:
+                modules.append(name)
+    return modules
+
+
+# الأنظمة الفرعية: الاسم -> الوحدات المستوردة
+SUBSYSTEMS = {
+    "التحليل": ["analysis"],
+    "المصادر": ["sources"],
+    "الجلب": ["fetchers"],
+    "التصدير": ["exporters"],
+    "المقالات": ["articles"],
+    "الجلب التدريجي": ["progressive"],
+    "الاتجاهات": ["trends"],
+    # تشمل ما تستورده هذه الوحدات (discovery، http_cache، singleflight، reporting...)
+    "تحميل التطبيق": app_modules(),
+    "واجهة Streamlit": ["streamlit"],
+    "RSS (feedparser)": ["feedparser"],
+    "HTML (bs4)": ["bs4"],
+    "ديناميكي (selenium)": ["selenium.webdriver"],
+    "المشاعر (textblob)": ["textblob"],
+    "تصدير Word (docx)": ["docx"],
+    "تصدير Excel (pandas)": ["pandas", "openpyxl"],
+}
+
+# مكتبات يجب ألا تُحمَّل بمجرد استيراد وحدات التطبيق
+HEAVY_MODULES = ["selenium", "docx", "pandas", "openpyxl", "textblob", "feedparser", "bs4", "requests", "torch", "transformers"]
+
+APP_MODULES = SUBSYSTEMS["تحميل التطبيق"]
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure(modules, repeat=5):
+    """استيراد الوحدات في عمليات منفصلة وإرجاع الأزمنة بالميلي ثانية"""
+    code = _PROBE.format(modules=modules, heavy=HEAVY_MODULES)
+    timings = []
+    heavy = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=HERE,
+            capture_output=True,
+            text=True
+        )
+        if result.returncode != 0:
+            error = result.stderr.strip().splitlines()
+            return None, [], error[-1] if error else "خطأ غير معروف"
+        data = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(data["seconds"] * 1000)
+        heavy = data["heavy"]
+    return timings, heavy, None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="قياس زمن استيراد كل نظام فرعي")
+    parser.add_argument("--repeat", type=int, default=5, help="عدد مرات القياس لكل نظام فرعي")
+    parser.add_argument("--budget", type=float, default=None, help="الحد الأقصى لزمن تحميل التطبيق (ms)")
+    args = parser.parse_args(argv)
+
+    failed = False
+    print(f"{'النظام الفرعي':<24} {'الأدنى (ms)':>12} {'الوسيط (ms)':>12}")
+    print("-" * 50)
+    for name, modules in SUBSYSTEMS.items():
+        timings, heavy, error = measure(modules, args.repeat)
+        if timings is None:
+            print(f"{name:<24} {'غير متاح':>12}  ({error})")
+            continue
+        print(f"{name:<24} {min(timings):>12.1f} {statistics.median(timings):>12.1f}")
+
+        if modules == APP_MODULES:
+            if heavy:
+                print(f"  ✗ مكتبات ثقيلة حُمّلت مبكراً: {', '.join(heavy)}")
+                failed = True
+            if args.budget is not None and statistics.median(timings) > args.budget:
+                print(f"  ✗ تجاوز ميزانية الإقلاع ({args.budget:.0f} ms)")
+                failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
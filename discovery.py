@@ -0,0 +1,298 @@
+"""اكتشاف مسارات سريعة قبل تحليل صفحات HTML
+
+يبحث في robots.txt عن خرائط الموقع، وفي خرائط أخبار Google، وفي وسوم
+<link rel="alternate"> للصفحة الرئيسية. خرائط الأخبار تُحلَّل بـ iterparse
+فتعطي الروابط والعناوين وتواريخ النشر الحقيقية. المسارات المكتشفة تُحفظ لكل
+مصدر ولا يُعاد الاكتشاف إلا عندما تتوقف عن العمل.
+"""
+import json
+import os
+import re
+import threading
+import urllib.parse
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import http_cache
+from analysis import analyze_sentiment, detect_category
+from fetchers import feed_articles, fetch_rss_news
+from reporting import status
+
+REGISTRY_PATH = os.path.join(http_cache.CACHE_DIR, "discovery.json")
+
+# مسارات شائعة لخرائط الأخبار عندما لا يذكرها robots.txt
+COMMON_NEWS_SITEMAPS = ["news-sitemap.xml", "sitemap-news.xml", "sitemap_news.xml"]
+
+MAX_SITEMAPS = 3  # أقصى عدد خرائط فرعية تُتبع من فهرس الخرائط
+MAX_SITEMAP_ITEMS = 200
+
+# مصدر لم يُكتشف له أي مسار لا يُعاد فحصه قبل هذه المدة
+RETRY_EMPTY_AFTER = timedelta(hours=24)
+
+NEWS_NS = "{http://www.google.com/schemas/sitemap-news/0.9}"
+
+_ALTERNATE_LINK = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+_FEED_TYPES = ("application/rss+xml", "application/atom+xml")
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _attribute(tag, name):
+    match = re.search(r'\b' + name + r'\s*=\s*["\']([^"\']+)["\']', tag, re.IGNORECASE)
+    return match.group(1).strip() if match else ""
+
+
+def _parse_date(value):
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+class DiscoveryRegistry:
+    """المسارات المكتشفة لكل مصدر، محفوظة في ملف JSON"""
+
+    def __init__(self, path=REGISTRY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, source_name):
+        with self._lock:
+            return self._load().get(source_name)
+
+    def set(self, source_name, endpoints):
+        with self._lock:
+            data = self._load()
+            data[source_name] = dict(endpoints, discovered_at=datetime.now().isoformat())
+            http_cache.write_atomic(self.path, json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
+
+
+registry = DiscoveryRegistry()
+
+
+def _fetch(url):
+    try:
+        return http_cache.fetch(url).content
+    except Exception:
+        return None
+
+
+def robots_sitemaps(site_url):
+    """روابط Sitemap المذكورة في robots.txt"""
+    content = _fetch(urllib.parse.urljoin(site_url, "/robots.txt"))
+    if not content:
+        return []
+    sitemaps = []
+    for line in content.decode('utf-8', errors='ignore').splitlines():
+        key, _, value = line.partition(":")
+        if key.strip().lower() == "sitemap" and value.strip():
+            sitemaps.append(value.strip())
+    return sitemaps
+
+
+def alternate_feeds(site_url):
+    """روابط RSS/Atom من وسوم <link rel="alternate"> في الصفحة الرئيسية"""
+    content = _fetch(site_url)
+    if not content:
+        return []
+    html = content.decode('utf-8', errors='ignore')
+    head = html[:html.lower().find("</head>")] if "</head>" in html.lower() else html[:100000]
+    feeds = []
+    for tag in _ALTERNATE_LINK.findall(head):
+        if "alternate" in _attribute(tag, "rel").lower() and _attribute(tag, "type").lower() in _FEED_TYPES:
+            href = _attribute(tag, "href")
+            if href:
+                feeds.append(urllib.parse.urljoin(site_url, href))
+    return feeds
+
+
+def parse_sitemap(content, limit=MAX_SITEMAP_ITEMS):
+    """تحليل متدفق لخريطة موقع
+
+    يعيد (النوع، العناصر): "index" مع قائمة (رابط، lastmod) للخرائط الفرعية،
+    أو "news" مع قواميس (loc, title, published)، أو "urlset" لخريطة عادية بلا عناوين.
+    """
+    kind = None
+    items = []
+    try:
+        for event, elem in ET.iterparse(BytesIO(content), events=("start", "end")):
+            name = _local(elem.tag)
+            if event == "start":
+                if kind is None:
+                    kind = "index" if name == "sitemapindex" else "urlset"
+                elif name == "news" and kind == "urlset":
+                    kind = "news"
+                continue
+
+            if name == "sitemap" and kind == "index":
+                fields = {_local(child.tag): (child.text or "").strip() for child in elem}
+                if fields.get("loc"):
+                    items.append((fields["loc"], fields.get("lastmod", "")))
+                elem.clear()
+            elif name == "url":
+                loc = title = published = ""
+                for child in elem.iter():
+                    child_name = _local(child.tag)
+                    if child_name == "loc" and not loc:
+                        loc = (child.text or "").strip()
+                    elif child.tag == NEWS_NS + "title" or (child_name == "title" and not title):
+                        # عنوان الخبر من news:title، لا من image:title أو video:title
+                        title = (child.text or "").strip()
+                    elif child_name == "publication_date":
+                        published = (child.text or "").strip()
+                if loc and title:
+                    items.append({"loc": loc, "title": title, "published": _parse_date(published)})
+                elem.clear()
+                if len(items) >= limit:
+                    break
+    except ET.ParseError:
+        pass
+    return kind, items
+
+
+def news_sitemaps(site_url):
+    """خرائط أخبار Google الصالحة للموقع (من robots.txt أو المسارات الشائعة)"""
+    candidates = robots_sitemaps(site_url) + [urllib.parse.urljoin(site_url, "/" + path) for path in COMMON_NEWS_SITEMAPS]
+    found = []
+    for url in candidates:
+        content = _fetch(url)
+        if not content:
+            continue
+        kind, items = parse_sitemap(content)
+        if kind == "news" and items:
+            found.append(url)
+        elif kind == "index":
+            # الخرائط التي تحمل "news" في اسمها أولاً ثم الأحدث
+            children = sorted(items, key=lambda item: ("news" in item[0].lower(), item[1]), reverse=True)
+            for child_url, _ in children[:MAX_SITEMAPS]:
+                child = _fetch(child_url)
+                if not child:
+                    continue
+                child_kind, child_items = parse_sitemap(child, limit=1)
+                if child_kind == "news" and child_items:
+                    found.append(child_url)
+        if found:
+            break
+    return found
+
+
+def discover_endpoints(source_info):
+    """اكتشاف روابط RSS وخرائط الأخبار لمصدر"""
+    site_url = source_info["url"]
+    rss_options = set(source_info.get("rss_options", []))
+    feeds = [feed for feed in alternate_feeds(site_url) if feed not in rss_options]
+    return {"feeds": list(dict.fromkeys(feeds)), "news_sitemaps": news_sitemaps(site_url)}
+
+
+def _matches(text, keywords):
+    if not keywords:
+        return True
+    if isinstance(keywords, str):
+        keywords = [k.strip() for k in keywords.split(",") if k.strip()]
+    if not keywords:
+        return True
+    return any(re.search(r'\b{}\b'.format(re.escape(k.lower())), text.lower()) for k in keywords)
+
+
+def fetch_sitemap_news(source_name, sitemap_url, keywords, date_from, date_to, chosen_category):
+    """أخبار خريطة أخبار Google مع فلترة التاريخ والكلمات والتصنيف
+
+    يعيد (الأخبار، عدد العناصر الخام) حتى يُعرف إن كانت الخريطة ما زالت تعمل.
+    """
+    content = _fetch(sitemap_url)
+    if not content:
+        return [], 0
+    kind, items = parse_sitemap(content)
+    if kind != "news":
+        return [], 0
+
+    news_list = []
+    for item in items:
+        published_dt = item["published"] or datetime.now()
+        if not (date_from <= published_dt.date() <= date_to):
+            continue
+        title = item["title"]
+        if not _matches(title, keywords):
+            continue
+        auto_category = detect_category(title)
+        if chosen_category != "الكل" and auto_category != chosen_category:
+            continue
+        news_list.append({
+            "source": source_name,
+            "title": title,
+            "summary": title,
+            "link": item["loc"],
+            "published": published_dt,
+            "image": "",
+            "sentiment": analyze_sentiment(title),
+            "category": auto_category,
+            "extraction_method": "News Sitemap"
+        })
+    return news_list, len(items)
+
+
+def _feed_entries(url):
+    snapshot = http_cache.default_store.snapshot(url)
+    if snapshot is None:
+        return 0
+    try:
+        return len(feed_articles(snapshot))
+    except Exception:
+        return 0
+
+
+def _fetch_endpoints(source_name, endpoints, keywords, date_from, date_to, chosen_category):
+    """(الأخبار، هل يعمل أي مسار)"""
+    news_list = []
+    working = False
+    for feed_url in endpoints.get("feeds", []):
+        news = fetch_rss_news(source_name, feed_url, keywords, date_from, date_to, chosen_category)
+        if news or _feed_entries(feed_url):
+            working = True
+        if news:
+            news_list.extend(news)
+            break
+    for sitemap_url in endpoints.get("news_sitemaps", []):
+        news, raw_count = fetch_sitemap_news(source_name, sitemap_url, keywords, date_from, date_to, chosen_category)
+        if raw_count:
+            working = True
+        news_list.extend(news)
+    return news_list, working
+
+
+def fetch_discovered_news(source_name, source_info, keywords, date_from, date_to, chosen_category):
+    """الجلب عبر المسارات المكتشفة؛ يُعاد الاكتشاف فقط إذا توقفت المحفوظة عن العمل"""
+    endpoints = registry.get(source_name)
+    if endpoints:
+        if not endpoints["feeds"] and not endpoints["news_sitemaps"]:
+            discovered_at = datetime.fromisoformat(endpoints["discovered_at"])
+            if http_cache.is_replaying() or datetime.now() - discovered_at < RETRY_EMPTY_AFTER:
+                return []
+        else:
+            news, working = _fetch_endpoints(source_name, endpoints, keywords, date_from, date_to, chosen_category)
+            if working or http_cache.is_replaying():
+                return news
+
+    if http_cache.is_replaying():
+        return []
+
+    status.info(":mag: البحث عن خرائط الأخبار وروابط RSS في الموقع...")
+    endpoints = discover_endpoints(source_info)
+    registry.set(source_name, endpoints)
+    if not endpoints["feeds"] and not endpoints["news_sitemaps"]:
+        return []
+    news, _ = _fetch_endpoints(source_name, endpoints, keywords, date_from, date_to, chosen_category)
+    return news
@@ -0,0 +1,29 @@
+"""تصدير الأخبار إلى Word و Excel و JSON"""
+from io import BytesIO
+import json
+
+from articles import ArticleBatch
+
+def export_to_word(news_list):
+    """تقرير Word متدفق: مقاطع الأخبار تُخزَّن مؤقتاً والملف في SpooledTemporaryFile"""
+    from word_report import build_word_report
+    return build_word_report(news_list)
+
+def export_to_excel(news_list):
+    import pandas as pd  # pandas و openpyxl لا تُحمَّلان إلا عند التصدير
+    if isinstance(news_list, ArticleBatch):
+        df = news_list.to_dataframe()
+    else:
+        df = pd.DataFrame(news_list)
+    columns_order = ['source', 'title', 'category', 'sentiment', 'published', 'summary', 'link', 'extraction_method']
+    df = df.reindex(columns=[col for col in columns_order if col in df.columns])
+    
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        df.to_excel(writer, index=False, sheet_name='الأخبار')
+    buffer.seek(0)
+    return buffer
+
+def export_to_json(news_list):
+    json_data = json.dumps(list(news_list), ensure_ascii=False, default=str, indent=2)
+    return json_data.encode('utf-8')
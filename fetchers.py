@@ -0,0 +1,513 @@
+"""جلب الأخبار من RSS ومواقع الويب وواجهات API"""
+from collections import OrderedDict
+from datetime import datetime
+import hashlib
+import json
+import re
+import threading
+import time
+
+import http_cache
+import reporting
+from reporting import status
+from singleflight import SingleFlight
+from analysis import summarize, analyze_sentiment, detect_category
+from sources import iraqi_news_sources
+
+def safe_request(url, timeout=10):
+    """طلب آمن مع معالجة الأخطاء (طلب شرطي عبر مخزن اللقطات)"""
+    try:
+        snapshot = http_cache.fetch(url, timeout=timeout)
+        return snapshot.content.decode('utf-8', errors='ignore')
+    except Exception as e:
+        status.warning(f"خطأ في الوصول لـ {url}: {str(e)}")
+        return None
+
+def page_url(base_url, page):
+    """تعديل الرابط لإضافة رقم الصفحة"""
+    if "?" in base_url:
+        return f"{base_url}&page={page}"
+    return f"{base_url}?page={page}"
+
+def fetch_multiple_pages(base_url, max_pages=5):
+    """جلب محتوى من عدة صفحات"""
+    all_html = []
+    for page in range(1, max_pages + 1):
+        try:
+            html = safe_request(page_url(base_url, page))
+            if html:
+                all_html.append(html)
+                if not http_cache.is_replaying():
+                    time.sleep(1)  # تجنب حظر IP
+        except:
+            continue
+    return all_html
+
+def get_dynamic_page(url):
+    """جلب محتوى الصفحات الديناميكية باستخدام Selenium"""
+    try:
+        if http_cache.is_replaying():
+            snapshot = http_cache.default_store.snapshot(url)
+            if snapshot is None:
+                raise http_cache.SnapshotMissing(f"لا توجد لقطة محفوظة لـ {url}")
+            return snapshot.content.decode('utf-8', errors='ignore')
+        # Selenium لا تُحمَّل إلا عند استخدام الطريقة الديناميكية
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        options = Options()
+        options.headless = True
+        driver = webdriver.Chrome(options=options)
+        driver.get(url)
+        time.sleep(3)  # انتظار تحميل المحتوى
+        html = driver.page_source
+        driver.quit()
+        http_cache.default_store.put(url, html)
+        return html
+    except Exception as e:
+        status.error(f"خطأ في جلب الصفحة الديناميكية: {str(e)}")
+        return None
+
+def fetch_from_api(api_url):
+    """جلب البيانات من واجهات API"""
+    try:
+        snapshot = http_cache.fetch(api_url, headers={'Accept': 'application/json'})
+        return json.loads(snapshot.content.decode('utf-8'))
+    except Exception as e:
+        status.error(f"خطأ في جلب البيانات من API: {str(e)}")
+        return None
+
+def parse_with_bs4(html):
+    """استخراج محتوى متقدم باستخدام BeautifulSoup"""
+    try:
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, 'html.parser')
+        articles = soup.find_all('article')  # أو أي علامة أخرى يستخدمها الموقع
+        
+        news_list = []
+        for article in articles:
+            title = article.find('h2').text if article.find('h2') else ""
+            link = article.find('a')['href'] if article.find('a') else ""
+            summary = article.find('p').text if article.find('p') else title
+            
+            news_list.append({
+                'title': title.strip(),
+                'summary': summarize(summary.strip()),
+                'link': link,
+                'published': datetime.now(),
+                'image': "",
+                'sentiment': analyze_sentiment(title),
+                'category': detect_category(title),
+                'extraction_method': 'BeautifulSoup'
+            })
+        return news_list
+    except Exception as e:
+        status.error(f"خطأ في تحليل المحتوى: {str(e)}")
+        return []
+
+def extract_news_from_html(html_content, source_name, base_url):
+    """استخراج الأخبار من HTML بطريقة ذكية"""
+    if not html_content:
+        return []
+    
+    news_list = []
+    
+    # البحث عن العناوين المحتملة
+    title_patterns = [
+        r'<h[1-4][^>]*>(.*?)</h[1-4]>',
+        r'<title[^>]*>(.*?)</title>',
+        r'<a[^>]*title="([^"]+)"',
+        r'<div[^>]*class="[^"]*title[^"]*"[^>]*>(.*?)</div>'
+    ]
+    
+    # البحث عن الروابط
+    link_patterns = [
+        r'<a[^>]*href="([^"]+)"[^>]*>(.*?)</a>',
+        r'href="([^"]+)"'
+    ]
+    
+    titles = []
+    links = []
+    
+    for pattern in title_patterns:
+        matches = re.findall(pattern, html_content, re.IGNORECASE | re.DOTALL)
+        for match in matches:
+            if isinstance(match, tuple):
+                title = match[0] if match[0] else match[1] if len(match) > 1 else ""
+            else:
+                title = match
+            title = re.sub(r'<[^>]+>', '', title).strip()
+            if title and len(title) > 10 and len(title) < 200:
+                titles.append(title)
+    
+    for pattern in link_patterns:
+        matches = re.findall(pattern, html_content, re.IGNORECASE)
+        for match in matches:
+            if isinstance(match, tuple):
+                link = match[0]
+            else:
+                link = match
+            if link and not link.startswith('#') and not link.startswith('javascript:'):
+                if link.startswith('/'):
+                    link = base_url + link
+                elif not link.startswith('http'):
+                    link = base_url + '/' + link
+                links.append(link)
+    
+    # دمج العناوين والروابط
+    for i, title in enumerate(titles[:50]):  # أول 50 خبر
+        link = links[i] if i < len(links) else base_url
+        
+        news_list.append({
+            "source": source_name,
+            "title": title,
+            "summary": title,  # استخدام العنوان كملخص مؤقت
+            "link": link,
+            "published": datetime.now(),
+            "image": "",
+            "sentiment": analyze_sentiment(title),
+            "category": detect_category(title),
+            "extraction_method": "HTML Parsing"
+        })
+    
+    return news_list
+
+# أخبار الصفحات المستخرجة حسب بصمة محتواها: الصفحة غير المتغيرة (304) لا يُعاد
+# تحليلها بالتعابير النمطية ولا حساب مشاعر عناوينها
+PAGE_CACHE_SIZE = 256
+_page_cache = OrderedDict()
+_page_cache_lock = threading.Lock()
+
+def extract_page_news(html, source_name, base_url, method="html"):
+    """استخراج أخبار صفحة واحدة مع تخزين النتيجة حسب محتوى الصفحة"""
+    key = (hashlib.sha256(html.encode('utf-8', errors='ignore')).digest(), source_name, base_url, method)
+    with _page_cache_lock:
+        news_list = _page_cache.get(key)
+        if news_list is not None:
+            _page_cache.move_to_end(key)
+    if news_list is None:
+        if method == "bs4":
+            news_list = parse_with_bs4(html)
+        else:
+            news_list = extract_news_from_html(html, source_name, base_url)
+        with _page_cache_lock:
+            _page_cache[key] = news_list
+            while len(_page_cache) > PAGE_CACHE_SIZE:
+                _page_cache.popitem(last=False)
+    return [dict(news) for news in news_list]
+
+FEED_CACHE_SIZE = 64
+_feed_cache = OrderedDict()
+_feed_cache_lock = threading.Lock()
+
+def feed_articles(snapshot):
+    """عناصر feed محلَّلة مرة واحدة لكل محتوى (التاريخ، الصورة، التصنيف)
+
+    التحليل من محتوى اللقطة في الذاكرة ويُخزَّن حسب بصمتها: الـ feed غير المتغير
+    (304) يعيد نفس القائمة؛ التحليل العاطفي يُحسب عند أول حاجة إليه.
+    """
+    with _feed_cache_lock:
+        articles = _feed_cache.get(snapshot.digest)
+        if articles is not None:
+            _feed_cache.move_to_end(snapshot.digest)
+            return articles
+    articles = _parse_feed(snapshot.content)
+    with _feed_cache_lock:
+        _feed_cache[snapshot.digest] = articles
+        while len(_feed_cache) > FEED_CACHE_SIZE:
+            _feed_cache.popitem(last=False)
+    return articles
+
+def extraction_cache_sizes():
+    """عدد العناصر في ذاكرتي الصفحات والـ feeds المحلَّلة"""
+    return {"pages": len(_page_cache), "feeds": len(_feed_cache)}
+
+def _parse_feed(content):
+    import feedparser
+    feed = feedparser.parse(content)
+    articles = []
+    for entry in getattr(feed, 'entries', []):
+        try:
+            title = entry.get('title', 'بدون عنوان')
+            summary = entry.get('summary', entry.get('description', title))
+            link = entry.get('link', '')
+            published = entry.get('published', '')
+            
+            # معالجة التاريخ بشكل محسن
+            published_dt = None
+            try:
+                published_dt = datetime.strptime(published, "%a, %d %b %Y %H:%M:%S %Z")
+            except:
+                try:
+                    published_dt = datetime.strptime(published, "%Y-%m-%dT%H:%M:%S%z")
+                except:
+                    try:
+                        published_dt = datetime.strptime(published, "%Y-%m-%d %H:%M:%S")
+                    except:
+                        published_dt = datetime.now()
+
+            # البحث عن صورة
+            image = ""
+            if hasattr(entry, 'media_content') and entry.media_content:
+                image = entry.media_content[0].get('url', '')
+            elif hasattr(entry, 'media_thumbnail') and entry.media_thumbnail:
+                image = entry.media_thumbnail[0].get('url', '')
+
+            articles.append({
+                "title": title,
+                "summary": summary,
+                "link": link,
+                "published": published_dt,
+                "image": image,
+                "sentiment": None,
+                "category": detect_category(title + " " + summary)
+            })
+        except Exception:
+            continue
+    return articles
+
+def fetch_rss_news(source_name, url, keywords, date_from, date_to, chosen_category, timeout=10):
+    """إصدارة محسنة مع إصلاح فلترة التاريخ"""
+    try:
+        try:
+            snapshot = http_cache.fetch(url, timeout=timeout)
+        except Exception:
+            return []  # الـ feed غير متاح: نترك المحاولة للرابط التالي
+        articles = feed_articles(snapshot)
+        news_list = []
+        
+        if not articles:
+            return []
+        
+        for article in articles:
+            # فلترة التاريخ بشكل صحيح (تاريخ بدون وقت للمقارنة)
+            if not (date_from <= article["published"].date() <= date_to):
+                continue
+
+            # فلترة الكلمات المفتاحية
+            full_text = article["title"] + " " + article["summary"]
+            if keywords:
+                if isinstance(keywords, str):
+                    keywords = [k.strip() for k in keywords.split(",") if k.strip()]
+                
+                if not any(re.search(r'\b{}\b'.format(re.escape(k.lower())), full_text.lower()) for k in keywords):
+                    continue
+
+            # فلترة التصنيف
+            if chosen_category != "الكل" and article["category"] != chosen_category:
+                continue
+
+            if article["sentiment"] is None:
+                article["sentiment"] = analyze_sentiment(article["summary"])
+            news_list.append(dict(article, source=source_name, extraction_method="RSS"))
+                
+        return news_list
+        
+    except Exception as e:
+        status.error(f"خطأ في جلب أخبار RSS: {str(e)}")
+        return []
+
+def fetch_website_news(source_name, url, keywords, date_from, date_to, chosen_category, max_pages=5, method="auto"):
+    """إصدارة محسنة مع زيادة عدد الصفحات"""
+    try:
+        status.info(f":arrows_counterclockwise: جاري تحليل موقع {source_name}...")
+        
+        # جلب محتوى من عدة صفحات (زيادة عدد الصفحات إلى 5)
+        all_html = []
+        if method == "dynamic":
+            html_content = get_dynamic_page(url)
+            if html_content:
+                all_html.append(html_content)
+        elif method == "api" and "api_url" in iraqi_news_sources.get(source_name, {}):
+            api_data = fetch_from_api(iraqi_news_sources[source_name]["api_url"])
+            return process_api_data(api_data, source_name, keywords, date_from, date_to, chosen_category)
+        else:
+            all_html = fetch_multiple_pages(url, max_pages)
+        
+        if not all_html:
+            return []
+        
+        filtered_news = parse_site_pages(all_html, source_name, url, keywords, chosen_category, method)
+        return filtered_news[:50]  # زيادة الحد إلى 50 خبر
+        
+    except Exception as e:
+        status.error(f"خطأ في جلب الأخبار من {source_name}: {str(e)}")
+        return []
+
+def parse_site_pages(all_html, source_name, url, keywords, chosen_category, method="html"):
+    """استخراج الأخبار من صفحات الموقع وفلترتها"""
+    # استخراج الأخبار من HTML
+    base_url = url.rstrip('/')
+    news_list = []
+    
+    for html in all_html:
+        news_list.extend(extract_page_news(html, source_name, base_url, method))
+    
+    # فلترة النتائج
+    filtered_news = []
+    for news in news_list:
+        # لا نطبق فلترة التاريخ على الأخبار من المواقع مباشرة
+        # لأنها عادة لا تحتوي على تواريخ دقيقة
+        
+        # فلترة الكلمات المفتاحية
+        full_text = news['title'] + " " + news['summary']
+        if keywords:
+            if isinstance(keywords, str):
+                keywords = [k.strip() for k in keywords.split(",") if k.strip()]
+            
+            if not any(re.search(r'\b{}\b'.format(re.escape(k.lower())), full_text.lower()) for k in keywords):
+                continue
+        
+        # فلترة التصنيف
+        if chosen_category != "الكل" and news['category'] != chosen_category:
+            continue
+        
+        filtered_news.append(news)
+    
+    return filtered_news
+
+def smart_news_fetcher(source_name, source_info, keywords, date_from, date_to, chosen_category, method="auto", max_pages=5, replay=None):
+    """جالب الأخبار الذكي - يجرب عدة طرق
+
+    replay=True يشغّل المسار كاملاً على اللقطات المحفوظة بدون شبكة.
+    """
+    if replay is None:
+        replay = http_cache.is_replaying()
+    with http_cache.replaying(replay):
+        return _smart_news_fetcher(source_name, source_info, keywords, date_from, date_to, chosen_category, method, max_pages)
+
+# جلب واحد لكل مجموعة معاملات متطابقة على مستوى العملية (عبر جلسات Streamlit)
+news_fetch_flight = SingleFlight("news")
+
+def shared_news_fetcher(source_name, source_info, keywords, date_from, date_to, chosen_category, method="auto", max_pages=5, replay=None):
+    """مثل smart_news_fetcher، لكن الطلبات المتطابقة المتزامنة تنضم إلى جلب جارٍ واحد"""
+    if replay is None:
+        replay = http_cache.is_replaying()
+    if isinstance(keywords, (list, tuple)):
+        keywords = ",".join(keywords)
+    key = (source_name, method, max_pages, replay, keywords, date_from, date_to, chosen_category)
+    news = news_fetch_flight.do(
+        key, _shared_fetch,
+        source_name, source_info, keywords, date_from, date_to, chosen_category, method, max_pages, replay
+    )
+    return list(news)
+
+def _shared_fetch(*args):
+    # الجلب المشترك لا يستدعي Streamlit: رسائل جلسة المنفّذ (وإعادة تشغيلها) لا
+    # تخص الجلسات المنضمة
+    with reporting.reporting_to(reporting.LogReporter()):
+        return smart_news_fetcher(*args)
+
+def fetch_flight_stats():
+    """إحصائيات دمج الطلبات: على مستوى المصدر وعلى مستوى الرابط"""
+    return [news_fetch_flight.stats(), http_cache.url_flight.stats()]
+
+def _smart_news_fetcher(source_name, source_info, keywords, date_from, date_to, chosen_category, method, max_pages):
+    all_news = []
+    
+    # المحاولة الأولى: RSS
+    if method in ["auto", "rss"] and source_info.get("rss_options"):
+        status.info(":arrows_counterclockwise: المحاولة الأولى: البحث عن RSS...")
+        for rss_url in source_info["rss_options"]:
+            try:
+                news = fetch_rss_news(source_name, rss_url, keywords, date_from, date_to, chosen_category)
+                if news:
+                    status.success(f":white_check_mark: تم العثور على {len(news)} خبر من RSS: {rss_url}")
+                    all_news.extend(news)
+                    if method == "rss":
+                        return all_news  # إذا كان الخيار RSS فقط
+                    break
+            except:
+                continue
+    
+    # مسار سريع: خرائط الأخبار وروابط RSS المكتشفة قبل تحليل الصفحات
+    discovered_news = []
+    if method == "auto" and not all_news:
+        from discovery import fetch_discovered_news
+        discovered_news = fetch_discovered_news(source_name, source_info, keywords, date_from, date_to, chosen_category)
+        if discovered_news:
+            status.success(f":white_check_mark: تم العثور على {len(discovered_news)} خبر عبر الاكتشاف التلقائي")
+            all_news.extend(discovered_news)
+    
+    # المحاولة الثانية: تحليل الموقع مباشرة
+    if method in ["auto", "html", "dynamic", "bs4", "api"] and not discovered_news:
+        status.info(":arrows_counterclockwise: المحاولة الثانية: تحليل الموقع مباشرة...")
+        website_news = fetch_website_news(
+            source_name,
+            source_info["url"],
+            keywords,
+            date_from,
+            date_to,
+            chosen_category,
+            max_pages,
+            method if method != "auto" else "html"
+        )
+        if website_news:
+            status.success(f":white_check_mark: تم استخراج {len(website_news)} خبر من الموقع مباشرة")
+            all_news.extend(website_news)
+    
+    # إزالة المكرر
+    seen_titles = set()
+    unique_news = []
+    for news in all_news:
+        if news['title'] not in seen_titles:
+            seen_titles.add(news['title'])
+            unique_news.append(news)
+    
+    return unique_news
+
+def process_api_data(api_data, source_name, keywords, date_from, date_to, chosen_category):
+    """معالجة بيانات API"""
+    if not api_data:
+        return []
+    
+    news_list = []
+    for item in api_data:
+        try:
+            title = item.get('title', '')
+            summary = item.get('summary', title)
+            link = item.get('url', '')
+            published = item.get('published', '')
+            
+            # معالجة التاريخ
+            try:
+                published_dt = datetime.strptime(published, "%Y-%m-%dT%H:%M:%SZ")
+            except:
+                try:
+                    published_dt = datetime.strptime(published, "%Y-%m-%d %H:%M:%S")
+                except:
+                    published_dt = datetime.now()
+            
+            # فلترة التاريخ
+            if not (date_from <= published_dt.date() <= date_to):
+                continue
+
+            # فلترة الكلمات المفتاحية
+            full_text = title + " " + summary
+            if keywords:
+                if isinstance(keywords, str):
+                    keywords = [k.strip() for k in keywords.split(",") if k.strip()]
+                
+                if not any(re.search(r'\b{}\b'.format(re.escape(k.lower())), full_text.lower()) for k in keywords):
+                    continue
+
+            # فلترة التصنيف
+            auto_category = detect_category(full_text)
+            if chosen_category != "الكل" and auto_category != chosen_category:
+                continue
+
+            news_list.append({
+                "source": source_name,
+                "title": title,
+                "summary": summary,
+                "link": link,
+                "published": published_dt,
+                "image": item.get('image', ''),
+                "sentiment": analyze_sentiment(summary),
+                "category": auto_category,
+                "extraction_method": "API"
+            })
+            
+        except Exception as e:
+            continue
+    
+    return news_list
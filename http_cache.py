@@ -0,0 +1,214 @@
+"""مخزن لقطات HTTP: طلبات شرطية (ETag/Last-Modified) ووضع إعادة التشغيل بدون شبكة
+
+تُحفظ أجسام الاستجابات مضغوطة بحسب بصمتها (sha256) في blobs/، ويُحفظ لكل
+رابط سجل في index/ يحتوي على ETag و Last-Modified وبصمة آخر محتوى. المحتوى
+الذي لم يعد أي سجل في الفهرس يشير إليه يُحذف دورياً بعد مهلة سماح؛ الفهرس على
+القرص هو المرجع، فالعمليات التي تتشارك المجلد لا تحذف ما يستخدمه غيرها.
+"""
+import contextlib
+import contextvars
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import namedtuple
+from datetime import datetime
+
+from singleflight import SingleFlight
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+CACHE_DIR = os.environ.get("NEWS_CACHE_DIR", ".news_cache")
+
+PRUNE_INTERVAL = 600  # ثوانٍ بين مرور حذف المحتوى غير المستخدم والذي يليه
+PRUNE_GRACE = 300  # المحتوى يبقى غير مستخدم هذه المدة على الأقل قبل حذفه
+
+# content: البايتات الخام، digest: بصمة المحتوى (مفتاح تخزين نتائج التحليل)
+Snapshot = namedtuple("Snapshot", ["url", "content", "digest"])
+
+_replay = contextvars.ContextVar("news_replay", default=os.environ.get("NEWS_REPLAY") == "1")
+
+
+class SnapshotMissing(LookupError):
+    """لا توجد لقطة محفوظة للرابط في وضع إعادة التشغيل"""
+
+
+@contextlib.contextmanager
+def replaying(enabled=True):
+    """تشغيل الجلب من اللقطات المحفوظة فقط، بدون أي اتصال بالشبكة"""
+    token = _replay.set(enabled)
+    try:
+        yield
+    finally:
+        _replay.reset(token)
+
+
+def is_replaying():
+    return _replay.get()
+
+
+def write_atomic(path, data):
+    """كتابة ملف دفعة واحدة (ملف مؤقت ثم استبدال) حتى لا يُقرأ نصف مكتوب"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+class SnapshotStore:
+    """مخزن محتوى معنون بالبصمة للاستجابات الخام"""
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self._orphans = {}
+        self._last_prune = time.monotonic()
+
+    def _index_path(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.root, "index", key[:2], key + ".json")
+
+    def _blob_path(self, digest):
+        return os.path.join(self.root, "blobs", digest[:2], digest + ".gz")
+
+    def entry(self, url):
+        """سجل الرابط (ETag, Last-Modified, digest) أو None"""
+        try:
+            with open(self._index_path(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _referenced(self):
+        """البصمات التي تشير إليها سجلات الفهرس على القرص"""
+        digests = set()
+        for directory, _, files in os.walk(os.path.join(self.root, "index")):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                        digests.add(json.load(f)["digest"])
+                except (OSError, ValueError, KeyError):
+                    continue
+        return digests
+
+    def prune(self, grace=PRUNE_GRACE):
+        """حذف المحتوى غير المستخدم منذ grace ثانية على الأقل وإرجاع عدد المحذوف
+
+        المهلة تحمي قارئاً قرأ سجلاً قديماً قبل تحديثه، ومحتوى كُتب ولم يُسجَّل بعد.
+        """
+        referenced = self._referenced()
+        now = time.monotonic()
+        orphans = {}
+        removed = 0
+        for directory, _, files in os.walk(os.path.join(self.root, "blobs")):
+            for name in files:
+                digest = name[:-len(".gz")]
+                if not name.endswith(".gz") or digest in referenced:
+                    continue
+                first_seen = self._orphans.get(digest, now)
+                if now - first_seen >= grace:
+                    with contextlib.suppress(OSError):
+                        os.unlink(os.path.join(directory, name))
+                        removed += 1
+                else:
+                    orphans[digest] = first_seen
+        self._orphans = orphans
+        return removed
+
+    def load(self, digest):
+        with gzip.open(self._blob_path(digest), 'rb') as f:
+            return f.read()
+
+    def put(self, url, content, etag=None, last_modified=None):
+        """حفظ محتوى الرابط وإرجاع بصمته"""
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        digest = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(digest)
+        with self._lock:
+            if not os.path.exists(blob_path):
+                write_atomic(blob_path, gzip.compress(content))
+            record = {
+                "url": url,
+                "digest": digest,
+                "etag": etag,
+                "last_modified": last_modified,
+                "fetched_at": datetime.now().isoformat()
+            }
+            write_atomic(self._index_path(url), json.dumps(record).encode('utf-8'))
+            due = time.monotonic() - self._last_prune >= PRUNE_INTERVAL
+            if due:
+                self._last_prune = time.monotonic()
+        if due:
+            self.prune()
+        return digest
+
+    def snapshot(self, url):
+        """آخر لقطة محفوظة للرابط أو None"""
+        record = self.entry(url)
+        if not record:
+            return None
+        try:
+            return Snapshot(url, self.load(record["digest"]), record["digest"])
+        except OSError:
+            return None
+
+    def fetch(self, url, timeout=10, headers=None):
+        """جلب شرطي: 304 يعيد المحتوى المحفوظ بنفس بصمته"""
+        if is_replaying():
+            snap = self.snapshot(url)
+            if snap is None:
+                raise SnapshotMissing(f"لا توجد لقطة محفوظة لـ {url}")
+            return snap
+
+        request_headers = dict(DEFAULT_HEADERS)
+        request_headers.update(headers or {})
+        record = self.entry(url)
+        if record and not os.path.exists(self._blob_path(record["digest"])):
+            record = None
+        if record:
+            if record.get("etag"):
+                request_headers['If-None-Match'] = record["etag"]
+            if record.get("last_modified"):
+                request_headers['If-Modified-Since'] = record["last_modified"]
+
+        req = urllib.request.Request(url, headers=request_headers)
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                content = response.read()
+                etag = response.headers.get('ETag')
+                last_modified = response.headers.get('Last-Modified')
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and record:
+                snap = self.snapshot(url)
+                if snap is not None:
+                    return snap
+            raise
+
+        digest = self.put(url, content, etag, last_modified)
+        return Snapshot(url, content, digest)
+
+
+default_store = SnapshotStore()
+
+# الجلسات التي تطلب نفس الرابط في نفس اللحظة تتشارك طلباً شبكياً واحداً
+url_flight = SingleFlight("url")
+
+
+def fetch(url, timeout=10, headers=None):
+    return url_flight.do((url, is_replaying()), default_store.fetch, url, timeout, headers)
@@ -0,0 +1,407 @@
+"""اختبار حمل وتحمّل متعدد الجلسات ضد خوادم محلية بديلة للمصادر
+
+يشغّل خادماً محلياً يقدّم RSS و HTML و API بزمن استجابة ونسبة فشل قابلين
+للضبط، ثم يشغّل عدة جلسات متزامنة تمر بنفس مسار الواجهة: الجلب، بناء
+ArticleBatch، رصد الاتجاهات، وتصدير Word و Excel و JSON في كل دورة.
+
+الاستخدام:
+    python loadtest.py --sessions 20 --duration 60
+    python loadtest.py --sessions 20 --duration 3600 --warmup 120 --json soak.json
+
+التقرير: مئينات زمن كل مرحلة، معدل الإنجاز، أقصى RSS، امتلاء الذاكرات المؤقتة
+المحدودة، وميل نمو RSS بعد الإحماء (MB/دقيقة) للكشف عن التسريب. الذاكرات
+المؤقتة تُشغَّل بحدود صغيرة حتى تمتلئ خلال الإحماء (--full-caches للحدود الحقيقية
+مع إحماء أطول).
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = [
+    "رئيس", "وزير", "انتخابات", "برلمان", "حكومة", "كرة", "مباراة", "دوري", "سوق", "اقتصاد",
+    "استثمار", "نفط", "تقنية", "تطبيق", "ذكاء", "مستشفى", "علاج", "جامعة", "طالب", "بغداد",
+    "العاصمة", "اجتماع", "قرار", "مشروع", "الأمن", "المنطقة", "تقرير", "إعلان", "مؤتمر", "خطة"
+]
+
+
+def _headline(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 9)))
+
+
+class StandInServer:
+    """خادم محلي بديل للمصادر: RSS مع ETag، صفحات HTML، و API بصيغة JSON"""
+
+    def __init__(self, latency_ms=50, jitter_ms=50, failure_rate=0.0, items=30, churn=0.2, seed=1):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.items = items
+        self.churn = churn
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.versions = defaultdict(int)
+        self.counts = defaultdict(int)
+        self.httpd = None
+
+    def _version(self, path):
+        # بعض الطلبات تغيّر المحتوى حتى لا تكون كل الاستجابات 304
+        with self.lock:
+            if self.rng.random() < self.churn:
+                self.versions[path] += 1
+            return self.versions[path]
+
+    def _body(self, path, version):
+        rng = random.Random(f"{path}:{version}")
+        now = datetime.now(timezone.utc)
+        if path.startswith("/feed/"):
+            entries = []
+            for i in range(self.items):
+                published = (now - timedelta(minutes=rng.randint(0, 600))).strftime("%a, %d %b %Y %H:%M:%S GMT")
+                entries.append(
+                    f"<item><title>{_headline(rng)}</title><link>http://local{path}/{version}/{i}</link>"
+                    f"<description>{_headline(rng)} {_headline(rng)}</description><pubDate>{published}</pubDate></item>"
+                )
+            return "application/rss+xml", f'<?xml version="1.0"?><rss version="2.0"><channel><title>stand-in</title>{"".join(entries)}</channel></rss>'
+        if path.startswith("/api/"):
+            data = [{
+                "title": _headline(rng),
+                "summary": _headline(rng),
+                "url": f"http://local{path}/{version}/{i}",
+                "published": (now - timedelta(minutes=rng.randint(0, 600))).strftime("%Y-%m-%dT%H:%M:%SZ")
+            } for i in range(self.items)]
+            return "application/json", json.dumps(data, ensure_ascii=False)
+        articles = "".join(
+            f'<article><h2>{_headline(rng)}</h2><a href="/story/{version}/{i}">اقرأ</a><p>{_headline(rng)}</p></article>'
+            for i in range(self.items)
+        )
+        return "text/html", f"<html><head><title>stand-in</title></head><body>{articles}</body></html>"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                with server.lock:
+                    server.counts["requests"] += 1
+                delay = max(server.latency_ms + server.rng.uniform(-server.jitter_ms, server.jitter_ms), 0)
+                time.sleep(delay / 1000)
+
+                if path == "/robots.txt" or "sitemap" in path:
+                    return self._send(404, "text/plain", b"")
+                if server.rng.random() < server.failure_rate:
+                    with server.lock:
+                        server.counts["failures"] += 1
+                    return self._send(503, "text/plain", b"stand-in failure")
+
+                version = server._version(self.path)
+                content_type, body = server._body(self.path, version)
+                body = body.encode("utf-8")
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    with server.lock:
+                        server.counts["not_modified"] += 1
+                    return self._send(304, content_type, b"", etag)
+                self._send(200, content_type + "; charset=utf-8", body, etag)
+
+            def _send(self, code, content_type, body, etag=None):
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if etag:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def stop(self):
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def shrink_caches():
+    """حدود صغيرة للذاكرات المؤقتة المحدودة على مستوى العملية
+
+    بحدودها الحقيقية تحتاج ساعات لتمتلئ (نافذة الاتجاهات 6 ساعات)، ونموها حتى
+    الامتلاء ليس تسريباً. بحدود صغيرة تمتلئ خلال الإحماء فيُحكم على ميل RSS الخام.
+    """
+    import fetchers
+    import trends
+    import word_report
+    word_report.fragment_cache.max_bytes = 2 * 1024 * 1024
+    fetchers.PAGE_CACHE_SIZE = 32
+    fetchers.FEED_CACHE_SIZE = 8
+    engine = trends.default_engine
+    engine.bucket_seconds = 2
+    engine.window_buckets = 6
+    engine.max_seen = 2000
+
+
+def cache_fill():
+    """امتلاء كل ذاكرة مؤقتة محدودة كنسبة من حدها"""
+    import fetchers
+    import trends
+    import word_report
+    engine = trends.default_engine
+    sizes = fetchers.extraction_cache_sizes()
+    stats = engine.stats()
+    fragments = word_report.fragment_cache
+    return {
+        "word_fragments": fragments.size / fragments.max_bytes,
+        "pages": sizes["pages"] / fetchers.PAGE_CACHE_SIZE,
+        "feeds": sizes["feeds"] / fetchers.FEED_CACHE_SIZE,
+        "trends_window": stats["buckets"] / engine.window_buckets,
+        "trends_seen": stats["seen"] / engine.max_seen
+    }
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = max(int(round(p / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(k, len(ordered) - 1)]
+
+
+def slope_per_minute(samples):
+    """ميل انحدار خطي بسيط (MB لكل دقيقة) لعينات (ثانية، MB)"""
+    if len(samples) < 2:
+        return 0.0
+    n = len(samples)
+    mean_t = sum(t for t, _ in samples) / n
+    mean_m = sum(m for _, m in samples) / n
+    var = sum((t - mean_t) ** 2 for t, _ in samples)
+    if not var:
+        return 0.0
+    return sum((t - mean_t) * (m - mean_m) for t, m in samples) / var * 60
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.iterations = 0
+        self.articles = 0
+
+    def timed(self, stage, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            with self.lock:
+                self.errors[stage] += 1
+            raise
+        finally:
+            with self.lock:
+                self.latencies[stage].append(time.perf_counter() - start)
+
+
+def run_session(session_id, sources, args, recorder, stop_at):
+    # الاستيراد هنا بعد ضبط NEWS_CACHE_DIR في main
+    from articles import ArticleBatch
+    from exporters import export_to_word, export_to_excel, export_to_json
+    from fetchers import shared_news_fetcher, smart_news_fetcher
+    from trends import default_engine
+
+    rng = random.Random(session_id)
+    fetcher = shared_news_fetcher if args.coalesce else smart_news_fetcher
+    today = datetime.today().date()
+    while time.monotonic() < stop_at:
+        source_name, source_info = rng.choice(sources)
+        method = rng.choice(args.methods)
+        start = time.perf_counter()
+        try:
+            news = recorder.timed("fetch", fetcher, source_name, source_info, "", today - timedelta(days=14),
+                                  today, "الكل", method, args.pages)
+            batch = recorder.timed("batch", ArticleBatch.from_dicts, news)
+            recorder.timed("trends", default_engine.ingest, batch)
+            # الواجهة تعيد بناء ملفات التصدير في كل إعادة تشغيل للنتائج
+            if not args.no_export and batch:
+                recorder.timed("export_word", export_to_word, batch)
+                recorder.timed("export_excel", export_to_excel, batch)
+                recorder.timed("export_json", export_to_json, batch)
+        except Exception:
+            logging.getLogger("loadtest").exception("فشل دورة في الجلسة %s", session_id)
+            continue
+        with recorder.lock:
+            recorder.latencies["iteration"].append(time.perf_counter() - start)
+            recorder.iterations += 1
+            recorder.articles += len(batch)
+        if args.think_ms:
+            time.sleep(rng.uniform(0, args.think_ms) / 1000)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="اختبار حمل وتحمّل متعدد الجلسات")
+    parser.add_argument("--sessions", type=int, default=20, help="عدد الجلسات المتزامنة")
+    parser.add_argument("--duration", type=float, default=60, help="مدة التشغيل بالثواني")
+    parser.add_argument("--warmup", type=float, default=30, help="ثواني الإحماء المستبعدة من ميل الذاكرة")
+    parser.add_argument("--sources", type=int, default=5, help="عدد المصادر البديلة")
+    parser.add_argument("--methods", default="auto,rss,html,api", help="طرق الجلب المستخدمة (مفصولة بفواصل)")
+    parser.add_argument("--pages", type=int, default=2, help="عدد الصفحات لكل جلب HTML")
+    parser.add_argument("--items", type=int, default=30, help="عدد الأخبار في كل feed أو صفحة")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--failure-rate", type=float, default=0.02)
+    parser.add_argument("--churn", type=float, default=0.2, help="احتمال تغيّر محتوى الاستجابة")
+    parser.add_argument("--think-ms", type=float, default=500, help="أقصى انتظار بين دورات الجلسة")
+    parser.add_argument("--no-coalesce", dest="coalesce", action="store_false", help="بدون دمج الطلبات بين الجلسات")
+    parser.add_argument("--no-export", action="store_true", help="تخطي التصدير")
+    parser.add_argument("--sample-interval", type=float, default=5, help="فاصل قياس الذاكرة بالثواني")
+    parser.add_argument("--full-caches", action="store_true",
+                        help="الحدود الحقيقية للذاكرات المؤقتة (تحتاج إحماءً يكفي لامتلائها)")
+    parser.add_argument("--leak-threshold", type=float, default=1.0, help="ميل الذاكرة (MB/دقيقة) الذي يُعد تسريباً")
+    parser.add_argument("--json", help="حفظ التقرير في ملف JSON")
+    args = parser.parse_args(argv)
+    args.methods = [m.strip() for m in args.methods.split(",") if m.strip()]
+
+    # مخزن لقطات مؤقت معزول حتى لا يتأثر بالتخزين الحقيقي
+    cache_dir = tempfile.mkdtemp(prefix="news-loadtest-")
+    os.environ["NEWS_CACHE_DIR"] = cache_dir
+    logging.basicConfig(level=logging.ERROR)
+
+    import reporting
+    reporting.set_reporter(reporting.LogReporter())
+    from fetchers import fetch_flight_stats
+    from sources import iraqi_news_sources
+    if not args.full_caches:
+        shrink_caches()
+
+    server = StandInServer(args.latency_ms, args.jitter_ms, args.failure_rate, args.items, args.churn)
+    base = server.start()
+    sources = []
+    for i in range(args.sources):
+        name = f"مصدر بديل {i + 1}"
+        info = {
+            "url": f"{base}/site/{i}/",
+            "type": "website",
+            "rss_options": [f"{base}/feed/{i}.xml"],
+            "api_url": f"{base}/api/{i}"
+        }
+        # fetch_website_news يبحث عن api_url في المصادر العراقية
+        iraqi_news_sources[name] = info
+        sources.append((name, info))
+
+    recorder = Recorder()
+    start = time.monotonic()
+    stop_at = start + args.duration
+    threads = [
+        threading.Thread(target=run_session, args=(i, sources, args, recorder, stop_at), daemon=True)
+        for i in range(args.sessions)
+    ]
+    for thread in threads:
+        thread.start()
+
+    # كل عينة: (الثانية، RSS، امتلاء الذاكرات المؤقتة)
+    samples = []
+    while any(thread.is_alive() for thread in threads):
+        samples.append((time.monotonic() - start, current_rss_mb(), cache_fill()))
+        for thread in threads:
+            thread.join(timeout=args.sample_interval / max(len(threads), 1))
+    elapsed = time.monotonic() - start
+    samples.append((elapsed, current_rss_mb(), cache_fill()))
+    server.stop()
+
+    steady = [sample for sample in samples if sample[0] >= args.warmup]
+    leak_slope = slope_per_minute([(t, m) for t, m, _ in steady])
+    # الميل يُعتد به فقط إذا امتلأت الذاكرات المؤقتة قبل نهاية الإحماء
+    warmup_fill = steady[0][2] if steady else samples[-1][2]
+    not_full = [name for name, fill in warmup_fill.items() if fill < 0.9]
+    report = {
+        "sessions": args.sessions,
+        "duration_s": round(elapsed, 1),
+        "iterations": recorder.iterations,
+        "articles": recorder.articles,
+        "throughput_per_s": round(recorder.iterations / elapsed, 2) if elapsed else 0,
+        "stages": {
+            stage: {
+                "count": len(values),
+                "errors": recorder.errors.get(stage, 0),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p90_ms": round(percentile(values, 90) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "max_ms": round(max(values) * 1000, 1) if values else 0
+            }
+            for stage, values in recorder.latencies.items()
+        },
+        "memory": {
+            "start_mb": round(samples[0][1], 1),
+            "end_mb": round(samples[-1][1], 1),
+            "peak_mb": round(peak_rss_mb(), 1),
+            "slope_mb_per_min": round(leak_slope, 3),
+            "cache_fill_at_warmup": {name: round(fill, 2) for name, fill in warmup_fill.items()},
+            "caches_not_full": not_full,
+            "leak_suspected": leak_slope > args.leak_threshold
+        },
+        "server": dict(server.counts),
+        "coalescing": fetch_flight_stats()
+    }
+
+    print(f"الجلسات: {report['sessions']}  المدة: {report['duration_s']}s  الدورات: {report['iterations']}  "
+          f"المعدل: {report['throughput_per_s']}/s  الأخبار: {report['articles']}")
+    print(f"{'المرحلة':<14} {'العدد':>7} {'أخطاء':>6} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}  (ms)")
+    for stage, data in report["stages"].items():
+        print(f"{stage:<14} {data['count']:>7} {data['errors']:>6} {data['p50_ms']:>9} {data['p90_ms']:>9} "
+              f"{data['p99_ms']:>9} {data['max_ms']:>9}")
+    memory = report["memory"]
+    print(f"الذاكرة: البداية {memory['start_mb']} MB، النهاية {memory['end_mb']} MB، الأقصى {memory['peak_mb']} MB، "
+          f"الميل بعد الإحماء {memory['slope_mb_per_min']} MB/دقيقة")
+    fill = "، ".join(f"{name} {round(value * 100)}%" for name, value in memory["cache_fill_at_warmup"].items())
+    print(f"امتلاء الذاكرات المؤقتة عند نهاية الإحماء: {fill}")
+    if not_full:
+        print(f"⚠ لم تمتلئ قبل نهاية الإحماء: {', '.join(not_full)}؛ جزء من الميل قد يكون امتلاءها (زد --warmup)")
+    print(f"الخادم: {report['server']}")
+    for flight in report["coalescing"]:
+        print(f"دمج ({flight['name']}): {flight['executions']} تنفيذ / {flight['calls']} طلب، {flight['joins']} انضمام")
+    if memory["leak_suspected"]:
+        print(f"✗ نمو الذاكرة يتجاوز {args.leak_threshold} MB/دقيقة: تسريب محتمل")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 1 if memory["leak_suspected"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,262 @@
+"""جلب تدريجي بمهلة زمنية كلية
+
+كل خيار RSS وكل صفحة من صفحات الموقع وحدة جلب مستقلة في مجمع خيوط مشترك؛
+تُعاد أخبار كل وحدة فور اكتمالها، وعند انتهاء المهلة تُلغى الوحدات المتبقية
+وتُذكر في التحديث الأخير. ترتيب المراحل لكل مصدر كما في smart_news_fetcher:
+الاكتشاف التلقائي لا يبدأ إلا إذا لم يجد أي خيار RSS شيئاً، وصفحات الموقع تُجلب
+بعد نجاح RSS أو بعد اكتشاف لم يجد شيئاً. صفحات نفس الموقع تبقى متباعدة زمنياً
+كما في fetch_multiple_pages حتى لا يُحظر عنوان IP.
+"""
+import threading
+import time
+import urllib.parse
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import zip_longest
+
+import http_cache
+import reporting
+from discovery import fetch_discovered_news
+from fetchers import (
+    fetch_rss_news, fetch_website_news, parse_site_pages, safe_request, page_url
+)
+from sources import iraqi_news_sources
+
+# تحديث واحد لكل وحدة مكتملة؛ التحديث الأخير done=True ويحمل الوحدات المقطوعة
+FetchProgress = namedtuple("FetchProgress", ["source", "label", "news", "elapsed", "done", "cut_short"])
+
+MAX_SITE_NEWS = 50  # نفس حد fetch_website_news لكل مصدر
+MAX_WORKERS = 8
+PAGE_SPACING = 1.0  # أقل فاصل بين طلبي صفحتين لنفس الموقع (بالثواني)
+
+
+class HostScheduler:
+    """يرسل صفحات كل موقع إلى المجمع بالترتيب وبفاصل زمني أدنى عبر كل الجلسات
+
+    الصفحة المنتظرة لا تشغل خيطاً من المجمع: مؤقت يرسلها عند حلول دورها، والدور
+    يُحسب من لحظة بدء الطلب الفعلي. الصفحة الملغاة قبل دورها لا تستهلك دوراً.
+    """
+
+    def __init__(self, executor, spacing=PAGE_SPACING):
+        self.executor = executor
+        self.spacing = spacing
+        self._lock = threading.Lock()
+        self._queues = {}
+        self._last = {}
+        self._active = set()  # مواقع لها مؤقت أو صفحة أُرسلت ولم تبدأ
+
+    def submit(self, url, fn, *args):
+        future = Future()
+        host = urllib.parse.urlsplit(url).netloc
+        with self._lock:
+            self._queues.setdefault(host, deque()).append((future, fn, args))
+            if host not in self._active:
+                self._active.add(host)
+                self._schedule(host)
+        return future
+
+    def _schedule(self, host):
+        ready = self._last.get(host, float("-inf")) + self.spacing
+        timer = threading.Timer(max(ready - time.monotonic(), 0), self._dispatch, (host,))
+        timer.daemon = True
+        timer.start()
+
+    def _dispatch(self, host):
+        with self._lock:
+            queue = self._queues.get(host, deque())
+            while queue:
+                future, fn, args = queue.popleft()
+                if future.set_running_or_notify_cancel():
+                    break
+            else:
+                self._queues.pop(host, None)
+                self._active.discard(host)
+                return
+        self.executor.submit(self._run, host, future, fn, args)
+
+    def _run(self, host, future, fn, args):
+        with self._lock:
+            self._last[host] = time.monotonic()
+            if self._queues.get(host):
+                self._schedule(host)
+            else:
+                self._queues.pop(host, None)
+                self._active.discard(host)
+        try:
+            result = fn(*args)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+
+# مجمع واحد لكل العملية: إعادة تشغيل الصفحة لا تنشئ خيوطاً جديدة، والوحدات
+# المتروكة بعد المهلة لا تتراكم فوق هذا الحد
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="news-progressive")
+page_scheduler = HostScheduler(_executor)
+
+
+def _fetch_page(source_name, url, page, keywords, chosen_category, method, timeout):
+    html = safe_request(page_url(url, page), timeout=timeout)
+    if not html:
+        return []
+    return parse_site_pages([html], source_name, url, keywords, chosen_category, method)
+
+
+def _units(source_name, source_info, keywords, date_from, date_to, chosen_category, method, max_pages, timeout):
+    """مراحل الجلب للمصدر: (RSS، الاكتشاف، الموقع)، كل وحدة (النوع، الوصف، الدالة، المعاملات)"""
+    rss = []
+    discovery = []
+    site = []
+    if method in ["auto", "rss"] and source_info.get("rss_options"):
+        for rss_url in source_info["rss_options"]:
+            rss.append(("rss", f"RSS: {rss_url}", fetch_rss_news,
+                          (source_name, rss_url, keywords, date_from, date_to, chosen_category, timeout)))
+
+    # api بدون api_url تعود إلى صفحات الموقع كما في fetch_website_news
+    has_api = "api_url" in iraqi_news_sources.get(source_name, {})
+    if method in ["auto", "html", "bs4"] or (method == "api" and not has_api):
+        site_method = "html" if method == "auto" else method
+        for page in range(1, max_pages + 1):
+            site.append(("site", f"صفحة {page}", _fetch_page,
+                          (source_name, source_info["url"], page, keywords, chosen_category, site_method, timeout)))
+    elif method in ["dynamic", "api"]:
+        site.append(("site", method, fetch_website_news,
+                     (source_name, source_info["url"], keywords, date_from, date_to, chosen_category, max_pages, method)))
+
+    if method == "auto":
+        discovery.append(("discovery", "الاكتشاف التلقائي", fetch_discovered_news,
+                          (source_name, source_info, keywords, date_from, date_to, chosen_category)))
+    return rss, discovery, site
+
+
+def _run_unit(fn, args, replay, stop):
+    if stop.is_set():
+        return []
+    # رسائل الخيوط الخلفية تذهب إلى السجل لا إلى واجهة الجلسة
+    with http_cache.replaying(replay), reporting.reporting_to(reporting.LogReporter()):
+        return fn(*args)
+
+
+def progressive_news_fetcher(sources, keywords, date_from, date_to, chosen_category, method="auto", max_pages=5,
+                             deadline=20, replay=None):
+    """مولّد FetchProgress لقائمة (اسم المصدر، معلوماته) ضمن مهلة كلية بالثواني
+
+    لكل مصدر: أول خيار RSS ينجح يكفي (كما في smart_news_fetcher) وتُلغى بقية
+    خيارات RSS، وأخبار صفحات الموقع محدودة بـ 50 خبراً. العناوين المكررة تُحذف.
+    """
+    if replay is None:
+        replay = http_cache.is_replaying()
+    start = time.monotonic()
+    stop = threading.Event()
+    seen_titles = set()
+    rss_done = set()
+    site_counts = {}
+    pending = {}
+    # المراحل التي لم تبدأ بعد لكل مصدر: {"discovery": [...], "site": [...]}
+    held = {}
+
+    def submit(per_source):
+        # بالتناوب بين المصادر: أول وحدة لكل مصدر قبل الثانية لأي مصدر
+        for units in zip_longest(*per_source):
+            for unit in units:
+                if unit is None:
+                    continue
+                source_name, kind, label, fn, args = unit
+                if fn is _fetch_page and not replay:
+                    future = page_scheduler.submit(page_url(args[1], args[2]), _run_unit, fn, args, replay, stop)
+                else:
+                    future = _executor.submit(_run_unit, fn, args, replay, stop)
+                pending[future] = (source_name, kind, label)
+
+    def next_stage(source_name, stage):
+        # إرسال مرحلة محجوزة؛ الاكتشاف يسقط إذا بدأت الصفحات مباشرة
+        stages = held.get(source_name, {})
+        if stage == "site":
+            stages.pop("discovery", None)
+        units = stages.pop(stage, [])
+        if not stages:
+            held.pop(source_name, None)
+        if units:
+            submit([units])
+
+    try:
+        # المرحلة الأولى المتاحة لكل مصدر تبدأ فوراً، والبقية محجوزة
+        first = []
+        for source_name, source_info in sources:
+            rss, discovery, site = _units(source_name, source_info, keywords, date_from, date_to,
+                                          chosen_category, method, max_pages, min(10, deadline))
+            stages = [
+                (stage, [(source_name,) + unit for unit in units])
+                for stage, units in [("rss", rss), ("discovery", discovery), ("site", site)] if units
+            ]
+            if stages:
+                first.append(stages[0][1])
+                held[source_name] = dict(stages[1:])
+        submit(first)
+
+        while pending:
+            remaining = deadline - (time.monotonic() - start)
+            if remaining <= 0:
+                break
+            finished, _ = wait(list(pending), timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in finished:
+                if future not in pending:
+                    continue  # خيار RSS أُلغي بعد نجاح خيار آخر
+                source_name, kind, label = pending.pop(future)
+                try:
+                    news = future.result()
+                except Exception as e:
+                    reporting.logger.warning("فشل %s لـ %s: %s", label, source_name, e)
+                    news = []
+
+                if kind == "rss":
+                    if source_name in rss_done:
+                        continue
+                    if not news:
+                        # كل خيارات RSS فشلت: الاكتشاف إن وُجد وإلا صفحات الموقع
+                        if not any(s == source_name and k == "rss" for s, k, _ in pending.values()):
+                            next_stage(source_name, "discovery" if "discovery" in held.get(source_name, {}) else "site")
+                        continue
+                    rss_done.add(source_name)
+                    # خيار RSS آخر لنفس المصدر لم يعد لازماً
+                    for other, (other_source, other_kind, _) in list(pending.items()):
+                        if other_source == source_name and other_kind == "rss" and other.cancel():
+                            del pending[other]
+                    next_stage(source_name, "site")
+                elif kind == "discovery":
+                    # الصفحات تُجلب فقط إذا لم يجد الاكتشاف شيئاً
+                    if news:
+                        held.pop(source_name, None)
+                    else:
+                        next_stage(source_name, "site")
+                else:
+                    room = MAX_SITE_NEWS - site_counts.get(source_name, 0)
+                    news = news[:max(room, 0)]
+                    site_counts[source_name] = site_counts.get(source_name, 0) + len(news)
+
+                unique_news = []
+                for item in news:
+                    if item['title'] not in seen_titles:
+                        seen_titles.add(item['title'])
+                        unique_news.append(item)
+
+                yield FetchProgress(source_name, label, unique_news, time.monotonic() - start, False, [])
+
+        # ما تبقى بعد المهلة (خيارات RSS البديلة لمصدر نجح لا تُعد مقطوعة)
+        cut_short = [
+            (source_name, label)
+            for future, (source_name, kind, label) in pending.items()
+            if not (kind == "rss" and source_name in rss_done)
+        ]
+        # مراحل لم تبدأ لأن ما قبلها لم ينتهِ قبل المهلة
+        cut_short += [
+            (source_name, label)
+            for stages in held.values() for units in stages.values() for source_name, _, label, _, _ in units
+        ]
+        yield FetchProgress(None, None, [], time.monotonic() - start, True, cut_short)
+    finally:
+        # الوحدات التي لم تبدأ تُلغى (والصفحات المنتظرة تترك دورها)
+        stop.set()
+        for future in pending:
+            future.cancel()
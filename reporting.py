@@ -0,0 +1,54 @@
+"""رسائل الحالة أثناء الجلب: تُعرض في Streamlit افتراضياً أو تُسجَّل في الخدمات الأخرى"""
+import contextlib
+import contextvars
+import logging
+
+logger = logging.getLogger("news")
+
+_default = None
+_override = contextvars.ContextVar("news_reporter", default=None)
+
+
+class LogReporter:
+    """بديل لرسائل Streamlit يكتب إلى logging (للخدمات بدون واجهة)"""
+
+    def info(self, message):
+        logger.info(message)
+
+    def success(self, message):
+        logger.info(message)
+
+    def warning(self, message):
+        logger.warning(message)
+
+    def error(self, message):
+        logger.error(message)
+
+
+def set_reporter(reporter):
+    """تعيين مستقبل رسائل الحالة للعملية كاملة"""
+    global _default
+    _default = reporter
+
+
+@contextlib.contextmanager
+def reporting_to(reporter):
+    """توجيه رسائل الحالة مؤقتاً (مثلاً من خيوط الجلب الخلفية)"""
+    token = _override.set(reporter)
+    try:
+        yield
+    finally:
+        _override.reset(token)
+
+
+class _Status:
+    """يوجّه info/success/warning/error إلى المستقبل الحالي"""
+
+    def __getattr__(self, name):
+        reporter = _override.get() or _default
+        if reporter is None:
+            import streamlit as reporter
+        return getattr(reporter, name)
+
+
+status = _Status()
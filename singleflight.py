@@ -0,0 +1,78 @@
+"""دمج الطلبات المتزامنة: الطلبات المتطابقة الجارية تنتظر تنفيذاً واحداً وتتشارك نتيجته"""
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.abandoned = False
+
+
+class SingleFlight:
+    """تنفيذ واحد لكل مفتاح في نفس اللحظة على مستوى العملية كاملة"""
+
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.executions = 0
+        self.joins = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """تنفيذ fn أو الانضمام إلى تنفيذ جارٍ بنفس المفتاح
+
+        المنضمون يتشاركون النتيجة أو الاستثناء (Exception فقط). إذا توقف المنفّذ
+        باستثناء تحكم (مثل RerunException في Streamlit أو KeyboardInterrupt) فهو
+        يخصه وحده، فيعيد المنضمون المحاولة وأحدهم يصبح المنفّذ الجديد.
+        """
+        retry = False
+        while True:
+            with self._lock:
+                if not retry:
+                    self.calls += 1
+                call = self._calls.get(key)
+                if call is not None:
+                    if not retry:
+                        self.joins += 1
+                    leader = False
+                else:
+                    call = self._calls[key] = _Call()
+                    self.executions += 1
+                    leader = True
+
+            if not leader:
+                call.done.wait()
+                if call.abandoned:
+                    retry = True
+                    continue
+                if call.error is not None:
+                    raise call.error
+                return call.result
+
+            try:
+                call.result = fn(*args, **kwargs)
+                return call.result
+            except Exception as e:
+                call.error = e
+                raise
+            except BaseException:
+                call.abandoned = True
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "name": self.name,
+                "calls": self.calls,
+                "executions": self.executions,
+                "joins": self.joins,
+                "in_flight": len(self._calls),
+                "join_rate": round(self.joins / self.calls, 3) if self.calls else 0.0
+            }
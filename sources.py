@@ -0,0 +1,198 @@
+"""مصادر الأخبار المدعومة"""
+
+# مصادر الأخبار المحسّنة مع إضافة واجهات API
+general_rss_feeds = {
+    "BBC عربي": "http://feeds.bbci.co.uk/arabic/rss.xml",
+    "الجزيرة": "https://www.aljazeera.net/aljazeerarss/ar/home",
+    "RT Arabic": "https://arabic.rt.com/rss/",
+    "France24 عربي": "https://www.france24.com/ar/rss",
+    "سكاي نيوز عربية": "https://www.skynewsarabia.com/web/rss",
+    "عربي21": "https://arabi21.com/feed"
+}
+
+iraqi_news_sources = {
+    "وزارة الداخلية العراقية": {
+        "url": "https://moi.gov.iq/",
+        "type": "website",
+        "rss_options": [
+            "https://moi.gov.iq/feed/",
+            "https://moi.gov.iq/rss.xml"
+        ],
+        "api_url": "https://moi.gov.iq/api/news"
+    },
+    "هذا اليوم": {
+        "url": "https://hathalyoum.net/",
+        "type": "website",
+        "rss_options": [
+            "https://hathalyoum.net/feed/",
+            "https://hathalyoum.net/rss.xml"
+        ]
+    },
+    "العراق اليوم": {
+        "url": "https://iraqtoday.com/",
+        "type": "website",
+        "rss_options": [
+            "https://iraqtoday.com/feed/",
+            "https://iraqtoday.com/rss.xml"
+        ]
+    },
+    "رئاسة الجمهورية العراقية": {
+        "url": "https://presidency.iq/default.aspx",
+        "type": "website",
+        "rss_options": [
+            "https://presidency.iq/feed/",
+            "https://presidency.iq/rss.xml"
+        ]
+    },
+    "الشرق الأوسط": {
+        "url": "https://asharq.com/",
+        "type": "website",
+        "rss_options": [
+            "https://asharq.com/feed/",
+            "https://asharq.com/rss.xml"
+        ]
+    },
+    "RT Arabic - العراق": {
+        "url": "https://arabic.rt.com/focuses/10744-%D8%A7%D9%84%D8%B9%D8%B1%D8%A7%D9%82/",
+        "type": "website",
+        "rss_options": [
+            "https://arabic.rt.com/rss/"
+        ]
+    },
+    "إندبندنت عربية": {
+        "url": "https://www.independentarabia.com/",
+        "type": "website",
+        "rss_options": [
+            "https://www.independentarabia.com/rss"
+        ]
+    },
+    "فرانس 24 عربي": {
+        "url": "https://www.france24.com/ar/",
+        "type": "website",
+        "rss_options": [
+            "https://www.france24.com/ar/rss"
+        ]
+    }
+}
+
+world_news_sources = {
+    "CNN عربي": {
+        "url": "https://arabic.cnn.com/",
+        "type": "website",
+        "rss_options": [
+            "https://arabic.cnn.com/feed/",
+            "https://arabic.cnn.com/rss.xml"
+        ]
+    },
+    "Axios": {
+        "url": "https://www.axios.com/",
+        "type": "website",
+        "rss_options": [
+            "https://api.axios.com/feed/",
+            "https://www.axios.com/feeds/feed.xml"
+        ]
+    },
+    "BBC News": {
+        "url": "https://www.bbc.com/news",
+        "type": "website",
+        "rss_options": [
+            "http://feeds.bbci.co.uk/news/rss.xml",
+            "https://feeds.bbci.co.uk/news/world/rss.xml"
+        ]
+    },
+    "i24NEWS عربي": {
+        "url": "https://www.i24news.tv/ar",
+        "type": "website",
+        "rss_options": [
+            "https://www.i24news.tv/ar/rss",
+            "https://www.i24news.tv/ar/feed/"
+        ]
+    },
+    "France24 إنجليزي": {
+        "url": "https://www.france24.com/en/",
+        "type": "website",
+        "rss_options": [
+            "https://www.france24.com/en/rss",
+            "https://www.france24.com/en/africa/rss"
+        ]
+    },
+    "SwissInfo عربي": {
+        "url": "https://www.swissinfo.ch/ara/",
+        "type": "website",
+        "rss_options": [
+            "https://www.swissinfo.ch/ara/rss",
+            "https://www.swissinfo.ch/~rss/ara"
+        ]
+    },
+    "Reuters": {
+        "url": "https://www.reuters.com/",
+        "type": "website",
+        "rss_options": [
+            "https://feeds.reuters.com/reuters/topNews",
+            "https://feeds.reuters.com/Reuters/worldNews"
+        ]
+    },
+    "AP News": {
+        "url": "https://apnews.com/",
+        "type": "website",
+        "rss_options": [
+            "https://feeds.apnews.com/rss/apf-topnews",
+            "https://feeds.apnews.com/rss/apf-intlnews"
+        ]
+    },
+    "NBC News": {
+        "url": "https://www.nbcnews.com/",
+        "type": "website",
+        "rss_options": [
+            "https://feeds.nbcnews.com/nbcnews/public/news",
+            "https://feeds.nbcnews.com/nbcnews/public/world"
+        ]
+    },
+    "ABC News": {
+        "url": "https://abcnews.go.com/",
+        "type": "website",
+        "rss_options": [
+            "https://abcnews.go.com/abcnews/topstories",
+            "https://abcnews.go.com/abcnews/internationalheadlines"
+        ]
+    },
+    "The Independent": {
+        "url": "https://www.independent.co.uk/",
+        "type": "website",
+        "rss_options": [
+            "https://www.independent.co.uk/rss",
+            "https://www.independent.co.uk/news/world/rss"
+        ]
+    },
+    "RT Arabic العالمي": {
+        "url": "https://arabic.rt.com/",
+        "type": "website",
+        "rss_options": [
+            "https://arabic.rt.com/rss/",
+            "https://arabic.rt.com/rss/world/"
+        ]
+    },
+    "Sky News العربية العالمي": {
+        "url": "https://sarabic.ae/",
+        "type": "website",
+        "rss_options": [
+            "https://sarabic.ae/feed/",
+            "https://sarabic.ae/rss.xml"
+        ]
+    }
+}
+
+# أنواع المصادر كما تظهر في الواجهة
+SOURCE_GROUPS = {
+    "المصادر العامة": general_rss_feeds,
+    "المصادر العراقية": iraqi_news_sources,
+    "أبرز الأخبار في العالم": world_news_sources
+}
+
+def get_source_info(source_name):
+    """معلومات المصدر بالاسم (كما تستخدمها الواجهة) أو None"""
+    if source_name in general_rss_feeds:
+        return {"type": "rss", "url": general_rss_feeds[source_name]}
+    if source_name in iraqi_news_sources:
+        return iraqi_news_sources[source_name]
+    return world_news_sources.get(source_name)
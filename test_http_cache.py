@@ -0,0 +1,93 @@
+"""مخزن اللقطات: إعادة استخدام 304، حذف المحتوى غير المستخدم، وإعادة التشغيل بدون شبكة"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import http_cache
+from fetchers import feed_articles
+
+FEED = '<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{}</channel></rss>'
+ITEM = '<item><title>{}</title><link>http://example.test/{}</link><description>{}</description></item>'
+
+
+def _feed(*titles):
+    return FEED.format("".join(ITEM.format(title, i, title) for i, title in enumerate(titles))).encode("utf-8")
+
+
+@pytest.fixture
+def server():
+    state = {"body": _feed("الخبر الأول"), "requests": 0, "not_modified": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["requests"] += 1
+            etag = '"%d"' % hash(state["body"])
+            if self.headers.get("If-None-Match") == etag:
+                state["not_modified"] += 1
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", str(len(state["body"])))
+            self.end_headers()
+            self.wfile.write(state["body"])
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    state["url"] = f"http://127.0.0.1:{httpd.server_address[1]}/feed.xml"
+    yield state
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_not_modified_reuses_stored_content(tmp_path, server):
+    store = http_cache.SnapshotStore(str(tmp_path))
+    first = store.fetch(server["url"])
+    second = store.fetch(server["url"])
+    assert server["not_modified"] == 1
+    assert second.digest == first.digest and second.content == first.content
+
+
+def test_replay_serves_snapshot_without_network(tmp_path, server):
+    store = http_cache.SnapshotStore(str(tmp_path))
+    stored = store.fetch(server["url"])
+    with http_cache.replaying():
+        assert store.fetch(server["url"]).content == stored.content
+        with pytest.raises(http_cache.SnapshotMissing):
+            store.fetch(server["url"] + "?other")
+    assert server["requests"] == 1
+
+
+def test_prune_keeps_referenced_and_recent_content(tmp_path):
+    store = http_cache.SnapshotStore(str(tmp_path))
+    old = store.put("http://example.test/a", b"v1")
+    store.put("http://example.test/b", b"v1")
+    store.put("http://example.test/a", b"v2")
+    # v1 ما زال مستخدماً من b
+    assert store.prune(grace=0) == 0
+    store.put("http://example.test/b", b"v3")
+    # غير مستخدم لكن ضمن مهلة السماح
+    assert store.prune(grace=60) == 0
+    assert store.load(old) == b"v1"
+    assert store.prune(grace=0) == 1
+    with pytest.raises(OSError):
+        store.load(old)
+    # مخزن آخر على نفس المجلد (عملية أخرى) يرى نفس الفهرس
+    other = http_cache.SnapshotStore(str(tmp_path))
+    assert other.prune(grace=0) == 0
+    assert other.snapshot("http://example.test/a").content == b"v2"
+
+
+def test_feed_parsed_from_memory_after_blob_removed(tmp_path):
+    store = http_cache.SnapshotStore(str(tmp_path))
+    content = _feed("خبر قديم")
+    digest = store.put("http://example.test/feed", content)
+    snapshot = http_cache.Snapshot("http://example.test/feed", content, digest)
+    store.put("http://example.test/feed", _feed("خبر جديد"))
+    store.prune(grace=0)
+    assert [article["title"] for article in feed_articles(snapshot)] == ["خبر قديم"]
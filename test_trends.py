@@ -0,0 +1,69 @@
+"""رصد ارتفاع مصطنع في حجم جولة جلب كاملة عبر عدة مصادر"""
+import random
+from datetime import datetime
+
+from trends import TrendEngine
+
+LETTERS = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+SPIKE = "زلزالمفاجئ"
+
+
+def _sweep(rng, vocabulary, size, start, spiking=0):
+    articles = []
+    for i in range(size):
+        title = " ".join(rng.choice(vocabulary) for _ in range(8))
+        if i < spiking:
+            title += " " + SPIKE
+        articles.append({
+            "link": f"http://example.test/{start + i}",
+            "title": title,
+            "summary": " ".join(rng.choice(vocabulary) for _ in range(20)),
+            "source": f"مصدر{i % 5}",
+            "category": "سياسة"
+        })
+    rng.shuffle(articles)
+    return articles
+
+
+def _spike_detected(per_bucket, spiking, history=4):
+    rng = random.Random(per_bucket)
+    vocabulary = ["".join(rng.choice(LETTERS) for _ in range(6)) for _ in range(5000)]
+    engine = TrendEngine()
+    for bucket in range(history):
+        engine.ingest(_sweep(rng, vocabulary, per_bucket, bucket * per_bucket), now=bucket * 600 + 1)
+    now = history * 600 + 1
+    engine.ingest(_sweep(rng, vocabulary, per_bucket, history * per_bucket, spiking), now=now)
+    trends = {trend.term: trend for trend in engine.trends(now=now, limit=5)}
+    return trends.get(SPIKE)
+
+
+def test_spike_detected_at_sweep_scale():
+    for per_bucket, spiking in [(100, 15), (300, 20), (1000, 50)]:
+        trend = _spike_detected(per_bucket, spiking)
+        assert trend is not None, (per_bucket, spiking)
+        assert trend.count <= spiking
+
+
+def test_steady_terms_not_flagged():
+    rng = random.Random(7)
+    vocabulary = ["".join(rng.choice(LETTERS) for _ in range(6)) for _ in range(300)]
+    engine = TrendEngine()
+    for bucket in range(7):
+        engine.ingest(_sweep(rng, vocabulary, 300, bucket * 300), now=bucket * 600 + 1)
+    assert engine.trends(now=6 * 600 + 1) == []
+
+
+def test_first_fetch_backlog_not_flagged():
+    # أول جلب يحمل أخبار أسبوعين؛ كل خبر يُعدّ في فترة نشره
+    rng = random.Random(11)
+    vocabulary = ["".join(rng.choice(LETTERS) for _ in range(6)) for _ in range(300)]
+    engine = TrendEngine()
+    now = 1_000_000_000
+    articles = _sweep(rng, vocabulary, 2000, 0)
+    for i, article in enumerate(articles):
+        article["published"] = datetime.fromtimestamp(now - i * 14 * 86400 / len(articles))
+    spike = _sweep(rng, vocabulary, 20, len(articles), spiking=20)
+    for article in spike:
+        article["published"] = datetime.fromtimestamp(now - 60)
+    engine.ingest(articles + spike, now=now)
+    assert [trend.term for trend in engine.trends(now=now)] == [SPIKE]
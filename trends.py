@@ -0,0 +1,225 @@
+"""رصد الكلمات الصاعدة عبر كل الأخبار المجلوبة بذاكرة محدودة
+
+لكل نطاق (الكل، كل مصدر، كل تصنيف) حلقة من فترات زمنية؛ كل فترة تحمل
+Count-Min sketch محدود الحجم لعدّ الكلمات والعبارات الثنائية، مع قائمة مرشحين
+محدودة تحمل العدّ الفعلي لأكثر المصطلحات تكراراً في الفترة الحالية. المصطلح
+"صاعد" عندما يتجاوز عدّه في الفترة الحالية متوسطه المقدَّر من sketch الفترات
+السابقة بنسبة كبيرة.
+"""
+import heapq
+import math
+import re
+import threading
+import time
+from array import array
+from collections import Counter, OrderedDict, namedtuple
+from datetime import datetime
+
+ALL_SCOPE = ("all", "الكل")
+
+# كلمات شائعة لا تحمل موضوعاً
+STOPWORDS = {
+    "التي", "الذي", "الذين", "هذا", "هذه", "ذلك", "تلك", "كان", "كانت", "يكون", "قال", "وقال",
+    "بعد", "قبل", "على", "إلى", "الى", "عن", "حيث", "بين", "حول", "خلال", "عند", "منذ", "لكن",
+    "ولكن", "أكثر", "اليوم", "أمس", "غير", "فيه", "فيها", "منه", "منها", "وفي", "كما", "أيضا", "أيضاً",
+    "with", "from", "that", "this", "have", "will", "were", "been", "their", "about", "after", "says"
+}
+
+# عرض الـ sketch لكل فترة يتبع حجم الفترة السابقة في النطاق (عدد مرات ظهور
+# المصطلحات) بين هذين الحدين، فيبقى خطأ التقدير في حدود عدّ أو عدّين
+SKETCH_WIDTH = 4096
+MAX_SKETCH_WIDTH = 32768
+SKETCH_DEPTH = 3
+
+_TERM = re.compile(r'\b[أ-ي]{3,}\b|\b[A-Za-z]{4,}\b')
+
+# term: الكلمة أو العبارة، count: العدد في الفترة الحالية، baseline: المتوسط السابق
+Trend = namedtuple("Trend", ["term", "count", "baseline", "ratio", "score"])
+
+
+def extract_terms(text):
+    """الكلمات (بدون الشائعة) والعبارات الثنائية المتتالية كبديل بسيط للكيانات"""
+    words = [w.lower() for w in _TERM.findall(text or "") if w.lower() not in STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class CountMinSketch:
+    """تقدير تكرار العناصر بذاكرة ثابتة (width × depth عداد)"""
+    __slots__ = ("width", "depth", "table")
+
+    def __init__(self, width=SKETCH_WIDTH, depth=SKETCH_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.table = array('I', bytes(4 * width * depth))
+
+    def _cells(self, item):
+        width = self.width
+        return [row * width + hash((row, item)) % width for row in range(self.depth)]
+
+    def add(self, item, count=1):
+        """إضافة العنصر وإرجاع تقديره الجديد"""
+        table = self.table
+        estimate = None
+        for cell in self._cells(item):
+            table[cell] += count
+            if estimate is None or table[cell] < estimate:
+                estimate = table[cell]
+        return estimate
+
+    def estimate(self, item):
+        table = self.table
+        return min(table[cell] for cell in self._cells(item))
+
+
+class _Bucket:
+    __slots__ = ("sketch", "candidates", "estimates", "volume")
+
+    def __init__(self, width, depth):
+        self.sketch = CountMinSketch(width, depth)
+        self.candidates = Counter()
+        self.estimates = {}
+        self.volume = 0
+
+
+def _published_seconds(article):
+    # التواريخ بدون منطقة زمنية بالتوقيت المحلي كما تنتجها دوال الجلب
+    published = article.get('published')
+    if isinstance(published, datetime):
+        return published.timestamp()
+    return None
+
+
+class _Scope:
+    """حلقة فترات لنطاق واحد"""
+    __slots__ = ("buckets", "first_index")
+
+    def __init__(self, first_index):
+        self.buckets = OrderedDict()
+        self.first_index = first_index
+
+
+class TrendEngine:
+    """محرك رصد الاتجاهات على مستوى العملية"""
+
+    def __init__(self, bucket_seconds=600, window_buckets=36, width=SKETCH_WIDTH, max_width=MAX_SKETCH_WIDTH,
+                 depth=SKETCH_DEPTH, max_candidates=300, max_seen=50000):
+        self.bucket_seconds = bucket_seconds
+        self.window_buckets = window_buckets
+        self.width = width
+        self.max_width = max_width
+        self.depth = depth
+        self.max_candidates = max_candidates
+        self.max_seen = max_seen
+        self._scopes = {}
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _bucket(self, scope_key, index):
+        scope = self._scopes.get(scope_key)
+        if scope is None:
+            scope = self._scopes[scope_key] = _Scope(index)
+        scope.first_index = min(scope.first_index, index)
+        bucket = scope.buckets.get(index)
+        if bucket is None:
+            width = self.width
+            if scope.buckets:
+                volume = scope.buckets[max(scope.buckets)].volume
+                while width < volume and width < self.max_width:
+                    width *= 2
+            bucket = scope.buckets[index] = _Bucket(width, self.depth)
+            # الفترات الأقدم من النافذة تُحذف فتبقى الذاكرة محدودة (الفترات لا تُنشأ
+            # بالترتيب لأن الخبر يُعدّ في فترة نشره)
+            newest = max(scope.buckets)
+            for old in [i for i in scope.buckets if i <= newest - self.window_buckets]:
+                del scope.buckets[old]
+        return bucket
+
+    def ingest(self, articles, now=None):
+        """إضافة أخبار؛ الخبر نفسه (بالرابط أو العنوان) لا يُعدّ مرتين
+
+        الخبر يُعدّ في فترة نشره لا فترة جلبه، فأول جلب لمصدر (أخبار أسبوعين
+        دفعة واحدة) يملأ الفترات السابقة بدل أن يظهر كله ارتفاعاً في الفترة
+        الحالية. الأقدم من النافذة يُعدّ في أقدم فترة، والتاريخ المستقبلي في الحالية.
+        """
+        newest = int((now if now is not None else time.time()) // self.bucket_seconds)
+        oldest = newest - self.window_buckets + 1
+        added = 0
+        with self._lock:
+            for article in articles:
+                key = hash(article.get('link') or article.get('title'))
+                if key in self._seen:
+                    continue
+                self._seen[key] = None
+                if len(self._seen) > self.max_seen:
+                    self._seen.popitem(last=False)
+
+                terms = Counter(extract_terms(f"{article.get('title', '')} {article.get('summary', '')}"))
+                if not terms:
+                    continue
+                total = sum(terms.values())
+                published = _published_seconds(article)
+                if published is None:
+                    index = newest
+                else:
+                    index = min(max(int(published // self.bucket_seconds), oldest), newest)
+                scopes = [ALL_SCOPE, ("source", article.get('source')), ("category", article.get('category'))]
+                for scope_key in scopes:
+                    bucket = self._bucket(scope_key, index)
+                    estimates = bucket.estimates
+                    for term, count in terms.items():
+                        estimates[term] = bucket.sketch.add(term, count)
+                    bucket.volume += total
+                    bucket.candidates.update(terms)
+                    if len(bucket.candidates) > 2 * self.max_candidates:
+                        # الترتيب بتقدير الـ sketch (يشمل الظهور قبل دخول القائمة) حتى لا
+                        # يُطرد مصطلح ناشئ قبل أن يتراكم عدّه الفعلي
+                        keep = heapq.nlargest(self.max_candidates, estimates, key=estimates.__getitem__)
+                        bucket.candidates = Counter({term: bucket.candidates[term] for term in keep})
+                        bucket.estimates = {term: estimates[term] for term in keep}
+                added += 1
+        return added
+
+    def trends(self, scope=ALL_SCOPE, limit=15, min_count=3, min_ratio=3.0, now=None):
+        """المصطلحات الصاعدة في النطاق مرتبة حسب درجة الارتفاع"""
+        index = int((now if now is not None else time.time()) // self.bucket_seconds)
+        with self._lock:
+            scope_data = self._scopes.get(scope)
+            if scope_data is None or index not in scope_data.buckets:
+                return []
+            # لا خط أساس قبل اكتمال فترة سابقة واحدة على الأقل
+            periods = min(index - scope_data.first_index, self.window_buckets - 1)
+            if periods < 1:
+                return []
+            current = scope_data.buckets[index]
+            history = [bucket for i, bucket in scope_data.buckets.items() if index - self.window_buckets < i < index]
+
+            results = []
+            for term, count in current.candidates.most_common(self.max_candidates):
+                if count < min_count:
+                    continue
+                # الفترات الفارغة ضمن النافذة تُحسب أصفاراً في المتوسط
+                baseline = sum(bucket.sketch.estimate(term) for bucket in history) / periods
+                ratio = (count + 1) / (baseline + 1)
+                if ratio < min_ratio:
+                    continue
+                # انحراف تقريبي بافتراض توزيع بواسون حول المتوسط
+                score = (count - baseline) / math.sqrt(baseline + 1)
+                results.append(Trend(term, count, round(baseline, 2), round(ratio, 2), round(score, 2)))
+
+        results.sort(key=lambda trend: trend.score, reverse=True)
+        return results[:limit]
+
+    def scopes(self):
+        with self._lock:
+            return list(self._scopes)
+
+    def stats(self):
+        """امتلاء الحدود: عدد الأخبار المعدودة المحفوظة وأطول حلقة فترات"""
+        with self._lock:
+            return {
+                "seen": len(self._seen),
+                "buckets": max((len(scope.buckets) for scope in self._scopes.values()), default=0)
+            }
+
+
+default_engine = TrendEngine()
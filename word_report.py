@@ -0,0 +1,154 @@
+"""بناء تقرير Word بذاكرة محدودة من قالب مُعدّ مسبقاً ومقاطع XML
+
+القالب (الأنماط، الإعدادات، العلاقات) يُبنى مرة واحدة لكل عملية من المستند
+الافتراضي لـ python-docx. كل خبر يُحوَّل إلى مقطع WordprocessingML يُخزَّن
+مؤقتاً حسب محتواه، فتقرير يعيد نفس الأخبار لا يحوّل إلا الجديد منها. الملف
+يُكتب متدفقاً إلى SpooledTemporaryFile (ذاكرة ثم قرص) بدل BytesIO.
+"""
+import hashlib
+import re
+import sys
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+from xml.sax.saxutils import escape
+
+SPOOL_MAX_SIZE = 8 * 1024 * 1024  # ما فوق ذلك يُكتب إلى القرص
+FRAGMENT_CACHE_BYTES = 32 * 1024 * 1024  # بالبايت في الذاكرة
+
+# محارف غير مسموحة في XML (python-docx ترفضها برسالة خطأ)
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _text_xml(text):
+    text = escape(_INVALID_XML.sub('', str(text)))
+    # نفس سلوك python-docx: السطر الجديد <w:br/> والجدولة <w:tab/>
+    text = text.replace('\t', '</w:t><w:tab/><w:t xml:space="preserve">')
+    return text.replace('\n', '</w:t><w:br/><w:t xml:space="preserve">')
+
+
+def paragraph_xml(text, style=None):
+    style_xml = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ''
+    return f'<w:p>{style_xml}<w:r><w:t xml:space="preserve">{_text_xml(text)}</w:t></w:r></w:p>'
+
+
+@lru_cache(maxsize=1)
+def _template():
+    """أجزاء المستند الافتراضي: (الملفات الأخرى، بداية document.xml، نهايته)"""
+    from docx import Document  # python-docx تُستخدم لبناء القالب مرة واحدة فقط
+    buffer = BytesIO()
+    Document().save(buffer)
+    parts = []
+    with zipfile.ZipFile(buffer) as package:
+        for info in package.infolist():
+            if info.filename == "word/document.xml":
+                document = package.read(info).decode("utf-8")
+            else:
+                parts.append((info.filename, package.read(info)))
+    body_start = document.index("<w:body>") + len("<w:body>")
+    body_end = document.index("<w:sectPr")
+    return parts, document[:body_start], document[body_end:]
+
+
+class FragmentCache:
+    """مقاطع XML المحوّلة لكل خبر، محدودة بالحجم الكلي (LRU)"""
+
+    def __init__(self, max_bytes=FRAGMENT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            fragment = self._items.get(key)
+            if fragment is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return fragment
+            self.misses += 1
+        fragment = render()
+        with self._lock:
+            if key not in self._items:
+                self._items[key] = fragment
+                self.size += _fragment_bytes(fragment)
+                while self.size > self.max_bytes and self._items:
+                    _, evicted = self._items.popitem(last=False)
+                    self.size -= _fragment_bytes(evicted)
+        return fragment
+
+
+def _fragment_bytes(fragment):
+    # حجم الكائنات في الذاكرة: len() يعدّ المحارف وCPython يخزن العربية بـ 2 بايت للمحرف
+    head, tail = fragment
+    return sys.getsizeof(head) + sys.getsizeof(tail)
+
+
+fragment_cache = FragmentCache()
+
+
+def _article_fields(news):
+    return (
+        news["title"],
+        news["source"],
+        news["category"],
+        news["published"].strftime('%Y-%m-%d %H:%M:%S'),
+        news.get("extraction_method", "غير محدد"),
+        news["sentiment"],
+        news["summary"],
+        news["link"]
+    )
+
+
+def _render_article(fields):
+    """مقطع الخبر مقسوماً حول رقمه: (ما قبل الرقم، ما بعده) لأن الترقيم يتغير"""
+    title, source, category, published, method, sentiment, summary, link = fields
+    head = '<w:p><w:pPr><w:pStyle w:val="Heading2"/></w:pPr><w:r><w:t xml:space="preserve">'
+    tail = (
+        f'. {_text_xml(title)}</w:t></w:r></w:p>'
+        + paragraph_xml(f"المصدر: {source}")
+        + paragraph_xml(f"التصنيف: {category}")
+        + paragraph_xml(f"التاريخ: {published}")
+        + paragraph_xml(f"طريقة الاستخراج: {method}")
+        + paragraph_xml(f"التحليل العاطفي: {sentiment}")
+        + paragraph_xml(f"الملخص: {summary}")
+        + paragraph_xml(f"الرابط: {link}")
+        + paragraph_xml('---')
+    )
+    return head, tail
+
+
+def article_fragment(news):
+    fields = _article_fields(news)
+    key = hashlib.sha1("\x1f".join(fields).encode("utf-8")).digest()
+    return fragment_cache.get_or_render(key, lambda: _render_article(fields))
+
+
+def build_word_report(news_list, spool_max_size=SPOOL_MAX_SIZE):
+    """تقرير Word كملف مؤقت مفتوح عند بدايته"""
+    parts, document_start, document_end = _template()
+    output = tempfile.SpooledTemporaryFile(max_size=spool_max_size)
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as package:
+        for name, data in parts:
+            package.writestr(name, data)
+        with package.open("word/document.xml", "w") as document:
+            document.write(document_start.encode("utf-8"))
+            header = (
+                paragraph_xml('تقرير الأخبار المجمعة', "Title")
+                + paragraph_xml(f'تاريخ التقرير: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}')
+                + paragraph_xml(f'عدد الأخبار: {len(news_list)}')
+                + paragraph_xml('---')
+            )
+            document.write(header.encode("utf-8"))
+            for i, news in enumerate(news_list, 1):
+                head, tail = article_fragment(news)
+                document.write(f"{head}{i}{tail}".encode("utf-8"))
+            document.write(document_end.encode("utf-8"))
+    output.seek(0)
+    return output